@@ -1,178 +1,873 @@
 import heapq
+import math
+import time
 from collections import deque
 from abc import ABC, abstractmethod
+from maze_graph import FlatGrid, node_array, trace_path
+from hpa import ClusterHierarchy
+
+def graph_of(maze):
+    # Solvers accept a compiled graph directly, or compile (once) from a maze
+    if hasattr(maze, 'neighbors'):
+        return maze
+    return maze.get_graph()
+
+def to_positions(graph, nodes):
+    return [graph.position(node) for node in nodes]
+
+def breadth_first_tree(graph, root, targets=None):
+    # Unit-cost shortest-path tree; stops early once every target is reached
+    neighbors = graph.neighbors
+    dist = node_array(graph.num_nodes)
+    came_from = node_array(graph.num_nodes)
+    dist[root] = 0
+    remaining = None if targets is None else set(targets) - {root}
+    if remaining is not None and not remaining:
+        return dist, came_from
+    
+    queue = deque([root])
+    while queue:
+        current = queue.popleft()
+        next_dist = dist[current] + 1
+        for neighbor in neighbors(current):
+            if dist[neighbor] < 0:
+                dist[neighbor] = next_dist
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                if remaining is not None:
+                    remaining.discard(neighbor)
+                    if not remaining:
+                        return dist, came_from
+    
+    return dist, came_from
+
+class ShortestPathTree:
+    # One flood fill answering many queries; paths are rebuilt only on request.
+    # A forward tree holds paths root -> position, a reverse tree position -> root.
+    def __init__(self, graph, root, reverse=False):
+        self.graph = graph
+        self.root = root
+        self.reverse = reverse
+        search_graph = graph.reverse() if reverse else graph
+        self.dist, self.came_from = breadth_first_tree(search_graph, graph.index(root))
+    
+    def distance(self, position):
+        # Number of moves, or None when unreachable
+        dist = self.dist[self.graph.index(position)]
+        return dist if dist >= 0 else None
+    
+    def reachable(self, position):
+        return self.dist[self.graph.index(position)] >= 0
+    
+    def path(self, position):
+        node = self.graph.index(position)
+        if self.dist[node] < 0:
+            return []
+        nodes = trace_path(self.came_from, node)
+        if self.reverse:
+            nodes.reverse()
+        return to_positions(self.graph, nodes)
+
+class SearchStats:
+    # Optional search counters, passed as solve(maze, start, goal, stats=...).
+    # Solvers only consult it behind one boolean check per event, so leaving
+    # it out costs next to nothing. Hooks receive maze positions.
+    def __init__(self, on_expand=None, on_push=None):
+        self.on_expand = on_expand
+        self.on_push = on_push
+        self.begin(None)
+    
+    def begin(self, graph):
+        self.nodes_expanded = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.stale_pops = 0
+        self.reexpansions = 0
+        self.max_open_size = 0
+        self.max_closed_size = 0
+        self.phase_times = {}
+        self._graph = graph
+        self._expanded = bytearray(graph.num_nodes) if graph is not None else None
+        self._phase = 'setup'
+        self._phase_started = time.perf_counter()
+    
+    def mark(self, phase):
+        # Close the running phase (setup, search, reconstruct) and start the next
+        now = time.perf_counter()
+        if self._phase is not None:
+            elapsed = now - self._phase_started
+            self.phase_times[self._phase] = self.phase_times.get(self._phase, 0.0) + elapsed
+        self._phase, self._phase_started = phase, now
+    
+    def end(self):
+        self.mark(None)
+    
+    def expand(self, node, open_size):
+        self.heap_pops += 1
+        self.nodes_expanded += 1
+        if self._expanded[node]:
+            self.reexpansions += 1
+        else:
+            self._expanded[node] = 1
+            self.max_closed_size += 1  # The closed set only ever grows
+        if open_size > self.max_open_size:
+            self.max_open_size = open_size
+        if self.on_expand is not None:
+            self.on_expand(self._graph.position(node))
+    
+    def stale(self):
+        self.heap_pops += 1
+        self.stale_pops += 1
+    
+    def push(self, node, open_size):
+        self.heap_pushes += 1
+        if open_size > self.max_open_size:
+            self.max_open_size = open_size
+        if self.on_push is not None:
+            self.on_push(self._graph.position(node))
+    
+    def as_dict(self):
+        return {
+            'nodes_expanded': self.nodes_expanded,
+            'heap_pushes': self.heap_pushes,
+            'heap_pops': self.heap_pops,
+            'stale_pops': self.stale_pops,
+            'reexpansions': self.reexpansions,
+            'max_open_size': self.max_open_size,
+            'max_closed_size': self.max_closed_size,
+            'phase_times': dict(self.phase_times),
+        }
+
+class _NoStats:
+    # Stands in for SearchStats at phase boundaries when nobody asked for counters
+    def begin(self, graph):
+        pass
+    
+    def mark(self, phase):
+        pass
+    
+    def end(self):
+        pass
+
+NO_STATS = _NoStats()
+
+def finish_path(graph, came_from, node, stats):
+    stats.mark('reconstruct')
+    path = to_positions(graph, trace_path(came_from, node))
+    stats.end()
+    return path
+
+def no_path(stats):
+    stats.end()
+    return []
 
 class MazeSolver(ABC):
+    # Rough worst-case search bookkeeping per graph node, in bytes: parent
+    # and cost arrays plus one open-set entry. Used by MemoryCappedSolver.
+    bytes_per_node = 0
+    
+    def solve(self, maze, start, goal, stats=None):
+        return self.solve_graph(graph_of(maze), start, goal, stats)
+    
     @abstractmethod
-    def solve(self, maze, start, goal):
+    def solve_graph(self, graph, start, goal, stats=None):
         pass
+    
+    # Batch queries share one flood fill instead of looping solve(); the
+    # trees are exact shortest-path trees whichever solver they are called on
+    def shortest_path_tree(self, maze, start):
+        return ShortestPathTree(graph_of(maze), start)
+    
+    def reverse_path_tree(self, maze, goal):
+        return ShortestPathTree(graph_of(maze), goal, reverse=True)
+    
+    def distance_matrix(self, maze, points):
+        # matrix[i][j] is the move count from points[i] to points[j], None if unreachable
+        graph = graph_of(maze)
+        nodes = [graph.index(point) for point in points]
+        matrix = []
+        for node in nodes:
+            dist, _ = breadth_first_tree(graph, node, targets=nodes)
+            matrix.append([dist[other] if dist[other] >= 0 else None for other in nodes])
+        return matrix
 
 class AStarSolver(MazeSolver):
-    def heuristic(self, a, b):
-        if len(a) == 2:  # 2D
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-        else:  # 3D
-            return abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[2] - b[2])
-    
-    def solve(self, maze, start, goal):
-        open_set = []
-        heapq.heappush(open_set, (self.heuristic(start, goal), 0, start))
-        came_from = {}
-        g_score = {start: 0}
+    bytes_per_node = 100
+    
+    def __init__(self, heuristic=None):
+        # Optional provider with heuristic_to(graph, goal), such as a
+        # wavefront.DistanceField rooted at the goal for repeated queries
+        self.heuristic = heuristic
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        if self.heuristic is not None:
+            heuristic = self.heuristic.heuristic_to(graph, target)
+        else:
+            heuristic = graph.heuristic_to(target)
+        neighbors = graph.neighbors
+        came_from = node_array(graph.num_nodes)
+        g_score = node_array(graph.num_nodes)
+        g_score[source] = 0
+        open_set = [(heuristic(source), 0, source)]
+        if tracking:
+            stats.push(source, 1)
+        stats.mark('search')
         
         while open_set:
             _, cost, current = heapq.heappop(open_set)
+            if cost > g_score[current]:
+                # Stale entry: the node was re-queued with a shorter route
+                if tracking:
+                    stats.stale()
+                continue
+            if tracking:
+                stats.expand(current, len(open_set))
             
-            if current == goal:
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.append(start)
-                path.reverse()
-                return path
+            if current == target:
+                return finish_path(graph, came_from, current, stats)
             
-            for neighbor in maze.get_neighbors(current):
-                tentative_g = g_score[current] + 1
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            tentative_g = cost + 1
+            for neighbor in neighbors(current):
+                if g_score[neighbor] < 0 or tentative_g < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score = tentative_g + self.heuristic(neighbor, goal)
+                    f_score = tentative_g + heuristic(neighbor)
                     heapq.heappush(open_set, (f_score, tentative_g, neighbor))
+                    if tracking:
+                        stats.push(neighbor, len(open_set))
         
-        return []
+        return no_path(stats)
 
 class DijkstraSolver(MazeSolver):
-    def solve(self, maze, start, goal):
-        open_set = []
-        heapq.heappush(open_set, (0, start))
-        came_from = {}
-        dist = {start: 0}
+    bytes_per_node = 80
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        neighbors = graph.neighbors
+        came_from = node_array(graph.num_nodes)
+        dist = node_array(graph.num_nodes)
+        dist[source] = 0
+        open_set = [(0, source)]
+        if tracking:
+            stats.push(source, 1)
+        stats.mark('search')
         
         while open_set:
             cost, current = heapq.heappop(open_set)
+            if cost > dist[current]:
+                if tracking:
+                    stats.stale()
+                continue
+            if tracking:
+                stats.expand(current, len(open_set))
             
-            if current == goal:
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.append(start)
-                path.reverse()
-                return path
+            if current == target:
+                return finish_path(graph, came_from, current, stats)
             
-            for neighbor in maze.get_neighbors(current):
-                new_cost = dist[current] + 1
-                if neighbor not in dist or new_cost < dist[neighbor]:
+            new_cost = cost + 1
+            for neighbor in neighbors(current):
+                if dist[neighbor] < 0 or new_cost < dist[neighbor]:
                     dist[neighbor] = new_cost
                     came_from[neighbor] = current
                     heapq.heappush(open_set, (new_cost, neighbor))
+                    if tracking:
+                        stats.push(neighbor, len(open_set))
         
-        return []
+        return no_path(stats)
 
 class BidirectionalBFSSolver(MazeSolver):
-    def solve(self, maze, start, goal):
+    bytes_per_node = 24
+    
+    def solve_graph(self, graph, start, goal, stats=None):
         if start == goal:
             return [start]
         
-        queue_start = deque([start])
-        queue_goal = deque([goal])
-        visited_start = {start: None}
-        visited_goal = {goal: None}
-        meet_node = None
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        neighbors = graph.neighbors
+        
+        # -2 marks unvisited nodes, -1 marks the root of each search tree
+        visited_start = node_array(graph.num_nodes, -2)
+        visited_goal = node_array(graph.num_nodes, -2)
+        visited_start[source] = -1
+        visited_goal[target] = -1
+        queue_start = deque([source])
+        queue_goal = deque([target])
+        meet_node = -1
+        if tracking:
+            stats.push(source, 1)
+            stats.push(target, 2)
+        stats.mark('search')
         
         while queue_start and queue_goal:
             current_start = queue_start.popleft()
-            for neighbor in maze.get_neighbors(current_start):
-                if neighbor not in visited_start:
+            if tracking:
+                stats.expand(current_start, len(queue_start) + len(queue_goal))
+            for neighbor in neighbors(current_start):
+                if visited_start[neighbor] == -2:
                     visited_start[neighbor] = current_start
                     queue_start.append(neighbor)
-                    if neighbor in visited_goal:
+                    if tracking:
+                        stats.push(neighbor, len(queue_start) + len(queue_goal))
+                    if visited_goal[neighbor] != -2:
                         meet_node = neighbor
                         break
-            if meet_node:
+            if meet_node >= 0:
                 break
             
             current_goal = queue_goal.popleft()
-            for neighbor in maze.get_neighbors(current_goal):
-                if neighbor not in visited_goal:
+            if tracking:
+                stats.expand(current_goal, len(queue_start) + len(queue_goal))
+            for neighbor in neighbors(current_goal):
+                if visited_goal[neighbor] == -2:
                     visited_goal[neighbor] = current_goal
                     queue_goal.append(neighbor)
-                    if neighbor in visited_start:
+                    if tracking:
+                        stats.push(neighbor, len(queue_start) + len(queue_goal))
+                    if visited_start[neighbor] != -2:
                         meet_node = neighbor
                         break
-            if meet_node:
+            if meet_node >= 0:
                 break
         
-        if not meet_node:
-            return []
-        
-        path_start = []
-        node = meet_node
-        while node != start:
-            path_start.append(node)
-            node = visited_start[node]
-        path_start.append(start)
-        path_start.reverse()
+        if meet_node < 0:
+            return no_path(stats)
         
-        path_goal = []
-        node = meet_node
-        while node != goal:
-            node = visited_goal[node]
-            path_goal.append(node)
-        
-        return path_start + path_goal
+        stats.mark('reconstruct')
+        path_start = trace_path(visited_start, meet_node)
+        path_goal = trace_path(visited_goal, meet_node)
+        path_goal.reverse()
+        path = to_positions(graph, path_start + path_goal[1:])
+        stats.end()
+        return path
 
 class DFSSolver(MazeSolver):
-    def solve(self, maze, start, goal):
-        stack = [(start, [start])]
-        visited = set()
+    bytes_per_node = 1
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
         
-        while stack:
-            current, path = stack.pop()
-            if current == goal:
+        source, target = graph.index(start), graph.index(goal)
+        neighbors = graph.neighbors
+        visited = bytearray(graph.num_nodes)
+        visited[source] = 1
+        
+        # The stack is the current path plus one neighbor iterator per node on
+        # it, so memory grows with path depth rather than with pushed edges
+        path = [source]
+        iterators = [iter(neighbors(source))]
+        if tracking:
+            stats.push(source, 1)
+            stats.expand(source, 0)
+        stats.mark('search')
+        
+        while iterators:
+            if path[-1] == target:
+                stats.mark('reconstruct')
+                path = to_positions(graph, path)
+                stats.end()
                 return path
             
-            if current not in visited:
-                visited.add(current)
-                for neighbor in reversed(maze.get_neighbors(current)):
-                    stack.append((neighbor, path + [neighbor]))
+            for neighbor in iterators[-1]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    path.append(neighbor)
+                    iterators.append(iter(neighbors(neighbor)))
+                    if tracking:
+                        stats.push(neighbor, len(path))
+                        stats.expand(neighbor, len(path))
+                    break
+            else:
+                path.pop()
+                iterators.pop()
         
-        return []
+        return no_path(stats)
 
 class GreedyBestFirstSolver(MazeSolver):
-    def heuristic(self, a, b):
-        if len(a) == 2:  # 2D
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-        else:  # 3D
-            return abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[2] - b[2])
-    
-    def solve(self, maze, start, goal):
-        open_set = []
-        heapq.heappush(open_set, (self.heuristic(start, goal), start))
-        came_from = {}
-        came_from[start] = None
+    bytes_per_node = 76
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        heuristic = graph.heuristic_to(target)
+        neighbors = graph.neighbors
+        came_from = node_array(graph.num_nodes, -2)
+        came_from[source] = -1
+        open_set = [(heuristic(source), source)]
+        if tracking:
+            stats.push(source, 1)
+        stats.mark('search')
         
         while open_set:
             _, current = heapq.heappop(open_set)
+            if tracking:
+                stats.expand(current, len(open_set))
+            
+            if current == target:
+                return finish_path(graph, came_from, current, stats)
             
-            if current == goal:
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.reverse()
+            for neighbor in neighbors(current):
+                if came_from[neighbor] == -2:
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (heuristic(neighbor), neighbor))
+                    if tracking:
+                        stats.push(neighbor, len(open_set))
+        
+        return no_path(stats)
+
+class JumpPointSearchSolver(MazeSolver):
+    # A* over jump points on a uniform-cost 4-connected 2D grid. Straight runs
+    # are scanned without touching the heap: horizontal runs stop where a
+    # vertical side opens up behind a wall, vertical runs also stop wherever
+    # a horizontal scan from them would find such a point.
+    bytes_per_node = 150
+    
+    def solve(self, maze, start, goal, stats=None):
+        if not isinstance(maze, FlatGrid) and hasattr(maze, 'get_flat_grid'):
+            maze = maze.get_flat_grid()
+        return self.solve_graph(maze, start, goal, stats)
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        if not isinstance(graph, FlatGrid) or len(graph.shape) != 2:
+            raise ValueError("Jump Point Search needs a 2D rectangular grid")
+        if start == goal:
+            return [start]
+        
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        heuristic = graph.heuristic_to(target)
+        row_stride = graph.strides[0]
+        g_score = {source: 0}
+        came_from = {source: -1}
+        open_set = [(heuristic(source), 0, source)]
+        if tracking:
+            stats.push(source, 1)
+        stats.mark('search')
+        
+        while open_set:
+            _, cost, current = heapq.heappop(open_set)
+            if cost > g_score[current]:
+                if tracking:
+                    stats.stale()
+                continue  # Stale entry, a shorter route was found later
+            if tracking:
+                stats.expand(current, len(open_set))
+            
+            if current == target:
+                stats.mark('reconstruct')
+                path = self._expand(graph, trace_path(came_from, current))
+                stats.end()
+                return path
+            
+            for step in self._directions(current, came_from[current], row_stride):
+                jump_point = self._jump(graph, current, step, target)
+                if jump_point < 0:
+                    continue
+                tentative_g = cost + abs(jump_point - current) // abs(step)
+                if jump_point not in g_score or tentative_g < g_score[jump_point]:
+                    g_score[jump_point] = tentative_g
+                    came_from[jump_point] = current
+                    f_score = tentative_g + heuristic(jump_point)
+                    heapq.heappush(open_set, (f_score, tentative_g, jump_point))
+                    if tracking:
+                        stats.push(jump_point, len(open_set))
+        
+        return no_path(stats)
+    
+    def _directions(self, node, parent, row_stride):
+        if parent < 0:
+            return (-row_stride, row_stride, -1, 1)
+        if abs(node - parent) < row_stride:
+            step = 1 if node > parent else -1
+            return (step, -row_stride, row_stride)
+        step = row_stride if node > parent else -row_stride
+        return (step, -1, 1)
+    
+    def _jump(self, graph, node, step, target):
+        if abs(step) == 1:
+            return self._jump_horizontal(graph.cells, node, step, target, graph.strides[0])
+        return self._jump_vertical(graph.cells, node, step, target)
+    
+    def _jump_horizontal(self, cells, node, step, target, row_stride):
+        while True:
+            node += step
+            if cells[node]:
+                return -1
+            if node == target:
+                return node
+            # Forced neighbor: open above/below here but walled off behind
+            for side in (-row_stride, row_stride):
+                if not cells[node + side] and cells[node - step + side]:
+                    return node
+    
+    def _jump_vertical(self, cells, node, step, target):
+        row_stride = abs(step)
+        while True:
+            node += step
+            if cells[node]:
+                return -1
+            if node == target:
+                return node
+            for side in (-1, 1):
+                if not cells[node + side] and cells[node - step + side]:
+                    return node
+            if (self._jump_horizontal(cells, node, 1, target, row_stride) >= 0 or
+                    self._jump_horizontal(cells, node, -1, target, row_stride) >= 0):
+                return node
+    
+    def _expand(self, graph, jump_points):
+        # Fill in the straight runs between consecutive jump points
+        row_stride = graph.strides[0]
+        nodes = [jump_points[0]]
+        for node in jump_points[1:]:
+            delta = node - nodes[-1]
+            step = (1 if delta > 0 else -1) * (1 if abs(delta) < row_stride else row_stride)
+            nodes.extend(range(nodes[-1] + step, node + step, step))
+        return to_positions(graph, nodes)
+
+class IDAStarSolver(MazeSolver):
+    # Iterative-deepening A*: depth-first passes bounded by f = g + h that keep
+    # only the current path, plus a table of the best g seen per node capped
+    # at table_size entries. Cycles outside the table are re-explored, so a
+    # one-byte-per-node flood first rules out unreachable goals, and no pass
+    # runs with a bound beyond the size of the start's component.
+    bytes_per_node = 1
+    table_entry_bytes = 100
+    
+    def __init__(self, heuristic=None, table_size=1 << 16):
+        self.heuristic = heuristic
+        self.table_size = table_size
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        if self.heuristic is not None:
+            heuristic = self.heuristic.heuristic_to(graph, target)
+        else:
+            heuristic = graph.heuristic_to(target)
+        stats.mark('reachability')
+        component = self._component_size(graph, source, target)
+        if component is None:
+            return no_path(stats)
+        bound = heuristic(source)
+        stats.mark('search')
+        
+        while bound is not None and bound < component:
+            path, bound = self._search(graph.neighbors, heuristic, source, target, bound,
+                                       stats if tracking else None)
+            if path is not None:
+                stats.mark('reconstruct')
+                path = to_positions(graph, path)
+                stats.end()
+                return path
+        
+        return no_path(stats)
+    
+    def _component_size(self, graph, source, target):
+        # Nodes reachable from source, or None when target is not among them
+        neighbors = graph.neighbors
+        visited = bytearray(graph.num_nodes)
+        visited[source] = 1
+        stack = [source]
+        count = 1
+        while stack:
+            for neighbor in neighbors(stack.pop()):
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    count += 1
+                    stack.append(neighbor)
+        return count if visited[target] else None
+    
+    def _search(self, neighbors, heuristic, source, target, bound, stats):
+        # One bounded pass; returns (path, bound) on success, otherwise
+        # (None, smallest f that exceeded the bound), or (None, None) when
+        # nothing was cut off and the goal is unreachable
+        path = [source]
+        on_path = {source}
+        iterators = [iter(neighbors(source))]
+        best_g = {source: 0}
+        next_bound = None
+        if stats is not None:
+            stats.expand(source, 0)
+        
+        while iterators:
+            if path[-1] == target:
+                return path, bound
+            
+            g = len(path)
+            for neighbor in iterators[-1]:
+                if neighbor in on_path:
+                    continue
+                seen = best_g.get(neighbor)
+                if seen is not None and seen <= g:
+                    continue  # Already reached this pass from as close to the source
+                f = g + heuristic(neighbor)
+                if f > bound:
+                    if next_bound is None or f < next_bound:
+                        next_bound = f
+                    continue
+                if seen is not None or len(best_g) < self.table_size:
+                    best_g[neighbor] = g
+                path.append(neighbor)
+                on_path.add(neighbor)
+                iterators.append(iter(neighbors(neighbor)))
+                if stats is not None:
+                    stats.expand(neighbor, len(path))
+                break
+            else:
+                on_path.discard(path.pop())
+                iterators.pop()
+        
+        return None, next_bound
+
+class LPAStarSolver(MazeSolver):
+    # Lifelong Planning A*. g and rhs (the one-step lookahead distance) live
+    # on between solve() calls, and the solver listens to the maze's set_cell
+    # events; repeated queries on the same maze, start and goal only
+    # re-settle the nodes whose distances an edit actually changed.
+    bytes_per_node = 100
+    unreached = 2 ** 31 - 2
+    
+    def __init__(self):
+        self.maze = None
+        self.changed = []
+        self._query = None
+    
+    def solve(self, maze, start, goal, stats=None):
+        if maze is not self.maze:
+            self.watch(maze)
+        return self.solve_graph(graph_of(maze), start, goal, stats)
+    
+    def watch(self, maze):
+        if self.maze is not None:
+            self.maze.remove_change_listener(self.cell_changed)
+        self.maze = maze
+        self.changed = []
+        self._query = None
+        maze.add_change_listener(self.cell_changed)
+    
+    def cell_changed(self, position, blocked):
+        self.changed.append(position)
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        stats.begin(graph)
+        
+        if self._query != (graph, start, goal):
+            self._initialize(graph, start, goal)
+        else:
+            # Edits only change edges into the edited cell, so only its
+            # lookahead value needs recomputing before the repair search
+            for position in self.changed:
+                self._update_node(graph.index(position))
+        self.changed = []
+        stats.mark('search')
+        
+        self._settle(stats if tracking else None)
+        
+        target = graph.index(goal)
+        if self.g[target] >= self.unreached:
+            return no_path(stats)
+        stats.mark('reconstruct')
+        path = to_positions(graph, self._trace(target))
+        stats.end()
+        return path
+    
+    def _initialize(self, graph, start, goal):
+        self._query = (graph, start, goal)
+        self.source, self.target = graph.index(start), graph.index(goal)
+        # Keep the graphs rather than their bound neighbors(): set_cell may
+        # swap in patched adjacency after this point
+        self.graph = graph
+        self.reversed_graph = graph.reverse()
+        # Early termination needs a consistent heuristic; every maze's
+        # graph heuristic is one, since a move changes it by at most 1
+        self.heuristic = graph.heuristic_to(self.target)
+        self.g = node_array(graph.num_nodes, self.unreached)
+        self.rhs = node_array(graph.num_nodes, self.unreached)
+        self.rhs[self.source] = 0
+        self.open_set = [(self._key(self.source), self.source)]
+    
+    def _key(self, node):
+        best = min(self.g[node], self.rhs[node])
+        return (best + self.heuristic(node), best)
+    
+    def _update_node(self, node):
+        g, rhs = self.g, self.rhs
+        if node != self.source:
+            best = self.unreached
+            for predecessor in self.reversed_graph.neighbors(node):
+                if g[predecessor] < best:
+                    best = g[predecessor]
+            rhs[node] = best + 1 if best < self.unreached else self.unreached
+        if g[node] != rhs[node]:
+            heapq.heappush(self.open_set, (self._key(node), node))
+    
+    def _settle(self, stats):
+        g, rhs, open_set = self.g, self.rhs, self.open_set
+        target = self.target
+        while open_set:
+            key, node = open_set[0]
+            if g[node] == rhs[node] or key != self._key(node):
+                # Superseded entry: the node was re-queued or became consistent
+                heapq.heappop(open_set)
+                if stats is not None:
+                    stats.stale()
+                continue
+            if key >= self._key(target) and g[target] == rhs[target]:
+                break
+            
+            heapq.heappop(open_set)
+            if stats is not None:
+                stats.expand(node, len(open_set))
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]
+            else:
+                g[node] = self.unreached
+                self._update_node(node)
+            for neighbor in self.graph.neighbors(node):
+                self._update_node(neighbor)
+    
+    def _trace(self, node):
+        # Step back along any predecessor one move closer to the start
+        g = self.g
+        nodes = [node]
+        while node != self.source:
+            node = min(self.reversed_graph.neighbors(node), key=g.__getitem__)
+            nodes.append(node)
+        nodes.reverse()
+        return nodes
+
+class HPAStarSolver(MazeSolver):
+    # Hierarchical A* on rectangular mazes: plans over the maze's cached
+    # cluster graph (hpa.ClusterHierarchy), then walks each leg of the plan
+    # inside its cluster. Paths may run a few moves longer than the shortest
+    # one, but a query costs about the number of clusters crossed rather
+    # than the number of cells, and an edit only invalidates one cluster.
+    bytes_per_node = 2
+    
+    def __init__(self, cluster_size=16):
+        self.cluster_size = cluster_size
+    
+    def solve(self, maze, start, goal, stats=None):
+        if hasattr(maze, 'get_hierarchy'):
+            return self.search(maze.get_hierarchy(self.cluster_size), start, goal, stats)
+        return self.solve_graph(graph_of(maze), start, goal, stats)
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        if not isinstance(graph, FlatGrid):
+            raise ValueError("HPA* needs a rectangular grid")
+        # A bare grid gets a throwaway hierarchy
+        return self.search(ClusterHierarchy(graph, self.cluster_size), start, goal, stats)
+    
+    def search(self, hierarchy, start, goal, stats=None):
+        tracking = stats is not None
+        stats = stats if tracking else NO_STATS
+        graph = hierarchy.grid
+        stats.begin(graph)
+        
+        source, target = graph.index(start), graph.index(goal)
+        links = hierarchy.connect(source, target)
+        heuristic = graph.heuristic_to(target)
+        g_score = {source: 0}
+        came_from = {source: -1}
+        open_set = [(heuristic(source), 0, source)]
+        if tracking:
+            stats.push(source, 1)
+        stats.mark('search')
+        
+        while open_set:
+            _, cost, current = heapq.heappop(open_set)
+            if cost > g_score[current]:
+                if tracking:
+                    stats.stale()
+                continue
+            if tracking:
+                stats.expand(current, len(open_set))
+            
+            if current == target:
+                stats.mark('reconstruct')
+                nodes = [current]
+                while came_from[nodes[-1]] >= 0:
+                    nodes.append(came_from[nodes[-1]])
+                nodes.reverse()
+                path = to_positions(graph, hierarchy.refine(nodes))
+                stats.end()
                 return path
             
-            for neighbor in maze.get_neighbors(current):
-                if neighbor not in came_from:
+            for neighbor, step in hierarchy.edges_from(current, links):
+                tentative_g = cost + step
+                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    g_score[neighbor] = tentative_g
                     came_from[neighbor] = current
-                    heapq.heappush(open_set, (self.heuristic(neighbor, goal), neighbor))
+                    heapq.heappush(open_set, (tentative_g + heuristic(neighbor), tentative_g, neighbor))
+                    if tracking:
+                        stats.push(neighbor, len(open_set))
         
-        return []
+        return no_path(stats)
+
+class MemoryCappedSolver(MazeSolver):
+    # Runs solver while its estimated per-node bookkeeping fits in
+    # memory_limit bytes, and the depth-bounded fallback beyond that
+    def __init__(self, solver, fallback, memory_limit):
+        self.solver = solver
+        self.fallback = fallback
+        self.memory_limit = memory_limit
+    
+    def solve(self, maze, start, goal, stats=None):
+        return self.choose(maze).solve(maze, start, goal, stats)
+    
+    def solve_graph(self, graph, start, goal, stats=None):
+        return self.choose(graph).solve_graph(graph, start, goal, stats)
+    
+    def choose(self, maze):
+        # Size the search from the maze dimensions so nothing is compiled just to decide
+        if hasattr(maze, 'num_nodes'):
+            num_nodes = maze.num_nodes
+        else:
+            num_nodes = math.prod(maze.get_dimensions())
+        if num_nodes * self.solver.bytes_per_node > self.memory_limit:
+            return self.fallback
+        return self.solver
 
 class AlgorithmFactory:
-    def create_algorithm(self, algorithm_name):
+    def create_algorithm(self, algorithm_name, memory_limit=None):
+        solver = self._create(algorithm_name)
+        if memory_limit is None:
+            return solver
+        
+        # Shortest-path solvers fall back to IDA*, the others to plain DFS
+        if algorithm_name in ("DFS", "Greedy Best-First"):
+            fallback = DFSSolver()
+        else:
+            fallback = IDAStarSolver(table_size=max(1, memory_limit // IDAStarSolver.table_entry_bytes))
+        return MemoryCappedSolver(solver, fallback, memory_limit)
+    
+    def _create(self, algorithm_name):
         if algorithm_name == "A*":
             return AStarSolver()
         elif algorithm_name == "Dijkstra":
@@ -183,5 +878,13 @@ class AlgorithmFactory:
             return DFSSolver()
         elif algorithm_name == "Greedy Best-First":
             return GreedyBestFirstSolver()
+        elif algorithm_name == "Jump Point Search":
+            return JumpPointSearchSolver()
+        elif algorithm_name == "IDA*":
+            return IDAStarSolver()
+        elif algorithm_name == "LPA*":
+            return LPAStarSolver()
+        elif algorithm_name == "HPA*":
+            return HPAStarSolver()
         else:
             raise ValueError(f"Unknown algorithm: {algorithm_name}")
\ No newline at end of file
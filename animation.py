@@ -0,0 +1,82 @@
+import time
+
+
+class PathAnimation:
+    # Plays a path back on one repeating Tk timer instead of an after()
+    # callback per step. Every frame draws, in one batch, all the steps the
+    # playback clock says are due, so a late frame catches up rather than
+    # leaving callbacks queued; past max_steps_per_frame the clock is held
+    # back instead, so one frame never blocks the event loop for long.
+    def __init__(self, widget, path, draw_steps, speed=20, frame_ms=16, max_steps_per_frame=500,
+                 on_finish=None):
+        self.widget = widget
+        self.path = path
+        self.draw_steps = draw_steps  # Called with the list of positions due each frame
+        self.speed = speed  # Steps per second
+        self.frame_ms = frame_ms
+        self.max_steps_per_frame = max_steps_per_frame
+        self.on_finish = on_finish
+
+        self.drawn = 0
+        self.clock = 0.0  # Playback position in steps as of last_tick
+        self.last_tick = None
+        self.timer = None
+        self.cancelled = False
+
+    @property
+    def finished(self):
+        return self.cancelled or self.drawn >= len(self.path)
+
+    @property
+    def paused(self):
+        return self.timer is None and not self.finished
+
+    def start(self):
+        if self.timer is None and not self.finished:
+            self.last_tick = time.perf_counter()
+            self.timer = self.widget.after_idle(self._tick)
+        return self
+
+    def pause(self):
+        if self.timer is not None:
+            self.widget.after_cancel(self.timer)
+            self.timer = None
+
+    def resume(self):
+        self.start()
+
+    def cancel(self):
+        self.pause()
+        self.cancelled = True
+
+    def set_speed(self, speed):
+        if self.timer is not None:
+            self._advance_clock()
+        self.speed = speed
+
+    def _advance_clock(self):
+        now = time.perf_counter()
+        self.clock += (now - self.last_tick) * self.speed
+        self.last_tick = now
+
+    def _tick(self):
+        self.timer = None
+        if not self.widget.winfo_exists():
+            self.cancelled = True
+            return
+
+        # Step k is due once the clock passes k, so step 0 shows at once
+        self._advance_clock()
+        due = min(int(self.clock) + 1, len(self.path))
+        end = min(due, self.drawn + self.max_steps_per_frame)
+        if end < due:
+            self.clock = end - 1
+        if end > self.drawn:
+            self.draw_steps(self.path[self.drawn:end])
+            self.drawn = end
+
+        if self.finished:
+            if self.on_finish is not None:
+                self.on_finish()
+            return
+        self.timer = self.widget.after(self.frame_ms, self._tick)
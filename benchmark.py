@@ -0,0 +1,170 @@
+import argparse
+import csv
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from maze_types import MazeFactory
+from maze_generators import GENERATORS
+from maze_io import load_maze, maze_type_of
+from algorithms import AlgorithmFactory, SearchStats
+
+MAZE_TYPES = ["2D", "3D", "Circular", "Hexagonal"]
+ALGORITHMS = ["A*", "Dijkstra", "Bidirectional BFS", "DFS", "Greedy Best-First", "Jump Point Search", "HPA*"]
+# Algorithms that only run on some topologies
+SUPPORTED_TYPES = {"Jump Point Search": ("2D",), "HPA*": ("2D", "3D")}
+FIELDS = [
+    'maze_type', 'size', 'seed', 'generator', 'algorithm', 'runs', 'median_ms', 'p95_ms', 'min_ms',
+    'path_length', 'solved', 'nodes_expanded', 'heap_pushes', 'stale_pops', 'reexpansions',
+    'max_open_size', 'peak_kib', 'compile_ms', 'error'
+]
+
+def generate_maze(maze_type, size, seed, generator=None):
+    return MazeFactory().create_maze(maze_type, size, seed=seed, generator=generator)
+
+def percentile(samples, fraction):
+    # Nearest-rank percentile
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def search_counters(solver, maze, start, goal):
+    stats = SearchStats()
+    solver.solve(maze, start, goal, stats=stats)
+    return {
+        'nodes_expanded': stats.nodes_expanded,
+        'heap_pushes': stats.heap_pushes,
+        'stale_pops': stats.stale_pops,
+        'reexpansions': stats.reexpansions,
+        'max_open_size': stats.max_open_size,
+    }
+
+def measure_peak_memory(solver, maze, start, goal):
+    tracemalloc.start()
+    try:
+        solver.solve(maze, start, goal)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def benchmark_solver(maze, algorithm, warmup=2, repeats=10):
+    # Only solve() is inside the timed region: the solver is built and the
+    # maze graph compiled beforehand, and memory/search counters come from
+    # separate untimed runs so their bookkeeping does not skew the timings
+    start, goal = maze.get_start_position(), maze.get_goal_position()
+    solver = AlgorithmFactory().create_algorithm(algorithm)
+
+    for _ in range(warmup):
+        solver.solve(maze, start, goal)
+
+    samples = []
+    path = []
+    for _ in range(repeats):
+        started = time.perf_counter_ns()
+        path = solver.solve(maze, start, goal)
+        samples.append(time.perf_counter_ns() - started)
+
+    row = {
+        'algorithm': algorithm,
+        'runs': repeats,
+        'median_ms': statistics.median(samples) / 1e6,
+        'p95_ms': percentile(samples, 0.95) / 1e6,
+        'min_ms': min(samples) / 1e6,
+        'path_length': len(path),
+        'solved': bool(path),
+        'peak_kib': measure_peak_memory(solver, maze, start, goal) / 1024,
+    }
+    row.update(search_counters(solver, maze, start, goal))
+    return row
+
+def benchmark_maze(maze, labels, algorithms, warmup=2, repeats=10, log=None):
+    started = time.perf_counter_ns()
+    maze.get_graph()
+    compile_ms = (time.perf_counter_ns() - started) / 1e6
+
+    rows = []
+    for algorithm in algorithms:
+        if labels['maze_type'] not in SUPPORTED_TYPES.get(algorithm, (labels['maze_type'],)):
+            continue
+        row = dict(labels, algorithm=algorithm, compile_ms=compile_ms)
+        try:
+            row.update(benchmark_solver(maze, algorithm, warmup, repeats))
+        except Exception as e:
+            row['error'] = str(e)
+        rows.append(row)
+        if log is not None:
+            log(row)
+    return rows
+
+def run_benchmarks(maze_types, sizes, algorithms, seeds, warmup=2, repeats=10, log=None, generator=None):
+    rows = []
+    for maze_type in maze_types:
+        for size in sizes:
+            for seed in seeds:
+                maze = generate_maze(maze_type, size, seed, generator)
+                labels = {'maze_type': maze_type, 'size': size, 'seed': seed, 'generator': generator}
+                rows.extend(benchmark_maze(maze, labels, algorithms, warmup, repeats, log))
+    return rows
+
+def run_file_benchmarks(paths, algorithms, warmup=2, repeats=10, log=None):
+    # Mazes saved with maze_io.save_maze, so every machine runs the same instances
+    rows = []
+    for path in paths:
+        maze = load_maze(path)
+        labels = {'maze_type': maze_type_of(maze), 'size': maze.size, 'seed': maze.seed,
+                  'generator': maze.generator}
+        rows.extend(benchmark_maze(maze, labels, algorithms, warmup, repeats, log))
+    return rows
+
+def write_json(rows, stream):
+    json.dump(rows, stream, indent=2)
+    stream.write("\n")
+
+def write_csv(rows, stream):
+    writer = csv.DictWriter(stream, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+
+def format_row(row):
+    if row.get('error'):
+        return f"{row['maze_type']:>9} {row['size']:>5} {row['seed']:>5} {row['algorithm']:<18} error: {row['error']}"
+    return (f"{row['maze_type']:>9} {row['size']:>5} {row['seed']:>5} {row['algorithm']:<18} "
+            f"median {row['median_ms']:9.3f} ms  p95 {row['p95_ms']:9.3f} ms  "
+            f"path {row['path_length']:>6}  expanded {row['nodes_expanded']}  peak {row['peak_kib']:.1f} KiB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers without the GUI")
+    parser.add_argument("--types", nargs="+", default=MAZE_TYPES, choices=MAZE_TYPES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[15, 31, 63])
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--seed", type=int, default=0, help="first maze seed")
+    parser.add_argument("--mazes", type=int, default=3, help="seeded mazes per type and size")
+    parser.add_argument("--generator", choices=GENERATORS, help="perfect-maze generator (default: random noise)")
+    parser.add_argument("--files", nargs="+", help="benchmark saved maze files instead of generating mazes")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", help="file to write results to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + args.mazes)
+    log = (lambda row: print(format_row(row), file=sys.stderr)) if args.output else None
+    if args.files:
+        rows = run_file_benchmarks(args.files, args.algorithms,
+                                   warmup=args.warmup, repeats=args.repeats, log=log)
+    else:
+        rows = run_benchmarks(args.types, args.sizes, args.algorithms, seeds,
+                              warmup=args.warmup, repeats=args.repeats, log=log, generator=args.generator)
+
+    writer = write_json if args.format == "json" else write_csv
+    if args.output:
+        with open(args.output, "w", newline="") as stream:
+            writer(rows, stream)
+    else:
+        writer(rows, sys.stdout)
+
+if __name__ == "__main__":
+    main()
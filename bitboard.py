@@ -0,0 +1,247 @@
+from itertools import product
+
+# 0 (open) -> '1', anything else (wall) -> '0', for building row bit strings
+OPEN_DIGITS = bytes.maketrans(b'\x00\x01', b'10')
+# And back from a row's binary digits to cell bytes
+CELL_BYTES = bytes.maketrans(b'10', b'\x00\x01')
+
+
+class Bitboard:
+    # One bit per cell of a rectangular maze, set where the cell is open:
+    # each row along the last axis is a Python int with column j at bit j.
+    # Rows are indexed over the outer axes padded by an empty row per side,
+    # like FlatGrid, so row neighbors need no bounds checks. Searches keep
+    # their frontier as {row: bits} and only pay for the rows it touches.
+    # It can also be a maze's grid itself (packed=True): grid[i][j] and
+    # grid[z][i][j] read and write 0/1 cells through light views.
+    def __init__(self, shape, rows):
+        self.shape = tuple(shape)
+        self.cols = self.shape[-1]
+        self.rows = rows
+
+        self.row_strides = []
+        stride = 1
+        for extent in reversed(self.shape[:-1]):
+            self.row_strides.append(stride)
+            stride *= extent + 2
+        self.row_strides.reverse()
+        self.num_rows = stride
+        self.row_steps = tuple(sign * step for step in self.row_strides for sign in (-1, 1))
+
+    @classmethod
+    def from_maze(cls, maze):
+        return cls.from_grid(maze.grid, maze.get_dimensions())
+
+    @classmethod
+    def from_grid(cls, grid, shape=None):
+        if shape is None:
+            shape = (len(grid), len(grid[0]))
+        board = cls(shape, None)
+        rows = [0] * board.num_rows
+        layers = [((), grid)] if len(board.shape) == 2 else [((z,), layer) for z, layer in enumerate(grid)]
+        for prefix, layer in layers:
+            for i, row in enumerate(layer):
+                # Column 0 is bit 0, so it is the last digit
+                rows[board.row_index(prefix + (i,))] = int(bytes(row).translate(OPEN_DIGITS)[::-1], 2)
+        board.rows = rows
+        return board
+
+    def row_index(self, prefix):
+        row = 0
+        for coord, stride in zip(prefix, self.row_strides):
+            row += (coord + 1) * stride
+        return row
+
+    def locate(self, position):
+        return self.row_index(position[:-1]), 1 << position[-1]
+
+    def row_prefix(self, row):
+        coords = []
+        for stride in self.row_strides:
+            coord, row = divmod(row, stride)
+            coords.append(coord - 1)
+        return tuple(coords)
+
+    def is_open(self, position):
+        row, bit = self.locate(position)
+        return self.rows[row] & bit != 0
+
+    @property
+    def nbytes(self):
+        # Memory held by the row ints themselves
+        return sum(bits.__sizeof__() for bits in self.rows)
+
+    def get(self, position):
+        return 0 if self.is_open(position) else 1
+
+    def set(self, position, value):
+        self.update_cell(None, position, value != 0)
+
+    def row_bytes(self, prefix):
+        digits = format(self.rows[self.row_index(prefix)], f'0{self.cols}b')[::-1]
+        return digits[:self.cols].encode('ascii').translate(CELL_BYTES)
+
+    def set_row(self, prefix, values):
+        self.rows[self.row_index(prefix)] = int(bytes(values).translate(OPEN_DIGITS)[::-1], 2)
+
+    def copy_into(self, cells, strides):
+        # Fill a FlatGrid-style padded buffer (walls pre-filled) row by row;
+        # a bitboard row index times the FlatGrid row stride is the row's start
+        cols, row_stride = self.cols, strides[-2]
+        for prefix in product(*(range(extent) for extent in self.shape[:-1])):
+            start = self.row_index(prefix) * row_stride + 1
+            cells[start:start + cols] = self.row_bytes(prefix)
+
+    def tolist(self):
+        if len(self.shape) == 2:
+            return [list(row) for row in self]
+        return [[list(row) for row in layer] for layer in self]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, k):
+        k = _check_index(k, self.shape[0])
+        if len(self.shape) == 2:
+            return _Row(self, (k,))
+        return _Layer(self, k)
+
+    def __iter__(self):
+        for k in range(self.shape[0]):
+            yield self[k]
+
+    def update_cell(self, maze, position, blocked):
+        row, bit = self.locate(position)
+        if blocked:
+            self.rows[row] &= ~bit
+        else:
+            self.rows[row] |= bit
+
+    def positions(self, cells):
+        # Decode a {row: bits} cell set through each row's binary string
+        for row, bits in cells.items():
+            prefix = self.row_prefix(row)
+            digits = bin(bits)[:1:-1]
+            col = digits.find('1')
+            while col >= 0:
+                yield prefix + (col,)
+                col = digits.find('1', col + 1)
+
+    def fill_row(self, seeds, open_bits):
+        # Seeds plus every open cell joined to them by a run of open cells in
+        # the row. Adding the seeds to the open bits carries up through each
+        # run; the part of a run below a seed takes log2(cols) doubling shifts.
+        carry = (seeds | seeds << 1) & open_bits
+        filled = seeds | carry | ((open_bits + carry) ^ open_bits) & open_bits
+        shift = 1
+        while shift < self.cols and open_bits:
+            filled |= open_bits & (filled >> shift)
+            open_bits &= open_bits >> shift
+            shift <<= 1
+        return filled
+
+    def levels(self, source):
+        # BFS frontiers from source as {row: bits}: level k holds exactly the
+        # cells k moves away. Like the solvers, the source counts even if its
+        # own cell is blocked.
+        row, bit = self.locate(source)
+        rows, row_steps = self.rows, self.row_steps
+        frontier = {row: bit}
+        visited = {row: bit}
+        while frontier:
+            yield frontier
+            grown = {}
+            for row, bits in frontier.items():
+                spread = (bits << 1 | bits >> 1) & rows[row]
+                if spread:
+                    grown[row] = grown.get(row, 0) | spread
+                for step in row_steps:
+                    spread = bits & rows[row + step]
+                    if spread:
+                        grown[row + step] = grown.get(row + step, 0) | spread
+            frontier = {}
+            for row, bits in grown.items():
+                seen = visited.get(row, 0)
+                bits &= ~seen
+                if bits:
+                    frontier[row] = bits
+                    visited[row] = seen | bits
+
+    def distance(self, start, goal):
+        row, bit = self.locate(goal)
+        for level, frontier in enumerate(self.levels(start)):
+            if frontier.get(row, 0) & bit:
+                return level
+        return -1
+
+    def reachable_from(self, source, goal=None):
+        # Flood fill over a worklist of rows, filling whole runs of a row at
+        # once; returns the reached cells as {row: bits}, stopping early once
+        # goal is among them
+        row, bit = self.locate(source)
+        target_row, target = self.locate(goal) if goal is not None else (-1, 0)
+        rows, row_steps = self.rows, self.row_steps
+        reached = {row: self.fill_row(bit, rows[row])}
+        pending = [row]
+        while pending:
+            if reached.get(target_row, 0) & target:
+                break
+            row = pending.pop()
+            bits = reached[row]
+            for step in row_steps:
+                other = row + step
+                seen = reached.get(other, 0)
+                seeds = bits & rows[other] & ~seen
+                if seeds:
+                    reached[other] = seen | self.fill_row(seeds, rows[other])
+                    pending.append(other)
+        return reached
+
+    def is_reachable(self, start, goal):
+        row, bit = self.locate(goal)
+        return self.reachable_from(start, goal).get(row, 0) & bit != 0
+
+
+def _check_index(k, extent):
+    if k < 0:
+        k += extent
+    if not 0 <= k < extent:
+        raise IndexError("grid index out of range")
+    return k
+
+
+class _Layer:
+    def __init__(self, board, z):
+        self.board = board
+        self.z = z
+
+    def __len__(self):
+        return self.board.shape[1]
+
+    def __getitem__(self, i):
+        return _Row(self.board, (self.z, _check_index(i, self.board.shape[1])))
+
+    def __iter__(self):
+        for i in range(self.board.shape[1]):
+            yield _Row(self.board, (self.z, i))
+
+
+class _Row:
+    def __init__(self, board, prefix):
+        self.board = board
+        self.prefix = prefix
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, j):
+        return self.board.get(self.prefix + (_check_index(j, self.board.cols),))
+
+    def __setitem__(self, j, value):
+        self.board.set(self.prefix + (_check_index(j, self.board.cols),), value)
+
+    def __bytes__(self):
+        return self.board.row_bytes(self.prefix)
+
+    def __iter__(self):
+        return iter(self.board.row_bytes(self.prefix))
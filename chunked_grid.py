@@ -0,0 +1,187 @@
+import math
+
+
+class ChunkedGrid:
+    # 3D cell storage in cubes of chunk**3 cells, trimmed at the far edges.
+    # A chunk whose cells all hold one value is kept as that int; only mixed
+    # chunks own a bytearray (z, then rows, then columns), so memory follows
+    # the maze's detail rather than its volume. grid[z][i][j] goes through
+    # light views so code written for nested lists keeps working.
+    def __init__(self, shape, chunk=16, fill=1):
+        self.shape = tuple(shape)
+        self.chunk = chunk
+        self.counts = tuple(-(-extent // chunk) for extent in self.shape)
+        self.chunks = [fill] * math.prod(self.counts)
+
+    @classmethod
+    def from_nested(cls, grid, chunk=16):
+        grid_shape = (len(grid), len(grid[0]), len(grid[0][0]))
+        chunked = cls(grid_shape, chunk)
+        for z, layer in enumerate(grid):
+            for i, row in enumerate(layer):
+                chunked.set_row(z, i, bytes(row))
+        chunked.compact()
+        return chunked
+
+    @property
+    def nbytes(self):
+        # Cell bytes held by mixed chunks; uniform chunks cost one list slot
+        return sum(len(chunk) for chunk in self.chunks if not isinstance(chunk, int))
+
+    def _extents(self, cz, ci, cj):
+        size = self.chunk
+        depth, rows, cols = self.shape
+        return min(size, depth - cz * size), min(size, rows - ci * size), min(size, cols - cj * size)
+
+    def _key(self, cz, ci, cj):
+        return (cz * self.counts[1] + ci) * self.counts[2] + cj
+
+    def _locate(self, z, i, j):
+        size = self.chunk
+        cz, lz = divmod(z, size)
+        ci, li = divmod(i, size)
+        cj, lj = divmod(j, size)
+        _, height, width = self._extents(cz, ci, cj)
+        return self._key(cz, ci, cj), (lz * height + li) * width + lj
+
+    def _allocate(self, key, cz, ci, cj):
+        chunk = self.chunks[key]
+        if isinstance(chunk, int):
+            depth, height, width = self._extents(cz, ci, cj)
+            chunk = self.chunks[key] = bytearray((chunk,)) * (depth * height * width)
+        return chunk
+
+    def get(self, position):
+        key, offset = self._locate(*position)
+        chunk = self.chunks[key]
+        return chunk if isinstance(chunk, int) else chunk[offset]
+
+    def set(self, position, value):
+        key, offset = self._locate(*position)
+        chunk = self.chunks[key]
+        if isinstance(chunk, int):
+            if chunk == value:
+                return
+            z, i, j = position
+            size = self.chunk
+            chunk = self._allocate(key, z // size, i // size, j // size)
+        chunk[offset] = value
+        if chunk.count(value) == len(chunk):
+            self.chunks[key] = value
+
+    def row_bytes(self, z, i):
+        size = self.chunk
+        cz, lz = divmod(z, size)
+        ci, li = divmod(i, size)
+        parts = []
+        for cj in range(self.counts[2]):
+            _, height, width = self._extents(cz, ci, cj)
+            chunk = self.chunks[self._key(cz, ci, cj)]
+            if isinstance(chunk, int):
+                parts.append(bytes((chunk,)) * width)
+            else:
+                start = (lz * height + li) * width
+                parts.append(chunk[start:start + width])
+        return b''.join(parts)
+
+    def set_row(self, z, i, values):
+        # Write a whole row of cells; chunks it leaves uniform stay unallocated
+        size = self.chunk
+        cz, lz = divmod(z, size)
+        ci, li = divmod(i, size)
+        for cj in range(self.counts[2]):
+            _, height, width = self._extents(cz, ci, cj)
+            key = self._key(cz, ci, cj)
+            segment = values[cj * size:cj * size + width]
+            chunk = self.chunks[key]
+            if isinstance(chunk, int) and segment.count(chunk) == width:
+                continue
+            chunk = self._allocate(key, cz, ci, cj)
+            start = (lz * height + li) * width
+            chunk[start:start + width] = segment
+
+    def copy_into(self, cells, strides):
+        # Fill a FlatGrid-style padded buffer (walls pre-filled) chunk by
+        # chunk: one slice per chunk row, nothing at all for wall chunks
+        size = self.chunk
+        layer_stride, row_stride = strides[0], strides[1]
+        for cz in range(self.counts[0]):
+            for ci in range(self.counts[1]):
+                for cj in range(self.counts[2]):
+                    chunk = self.chunks[self._key(cz, ci, cj)]
+                    if chunk == 1:
+                        continue
+                    depth, height, width = self._extents(cz, ci, cj)
+                    uniform = bytes((chunk,)) * width if isinstance(chunk, int) else None
+                    start = 0
+                    for lz in range(depth):
+                        base = (cz * size + lz + 1) * layer_stride + (ci * size + 1) * row_stride + cj * size + 1
+                        for li in range(height):
+                            row = base + li * row_stride
+                            cells[row:row + width] = uniform if uniform is not None else chunk[start:start + width]
+                            start += width
+
+    def compact(self):
+        # Fold mixed chunks that have become uniform back into a single value
+        for key, chunk in enumerate(self.chunks):
+            if not isinstance(chunk, int) and chunk.count(chunk[0]) == len(chunk):
+                self.chunks[key] = chunk[0]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, z):
+        return _Layer(self, _check_index(z, self.shape[0]))
+
+    def __iter__(self):
+        for z in range(self.shape[0]):
+            yield _Layer(self, z)
+
+    def tolist(self):
+        return [[list(self.row_bytes(z, i)) for i in range(self.shape[1])] for z in range(self.shape[0])]
+
+
+def _check_index(k, extent):
+    if k < 0:
+        k += extent
+    if not 0 <= k < extent:
+        raise IndexError("grid index out of range")
+    return k
+
+
+class _Layer:
+    def __init__(self, grid, z):
+        self.grid = grid
+        self.z = z
+
+    def __len__(self):
+        return self.grid.shape[1]
+
+    def __getitem__(self, i):
+        return _Row(self.grid, self.z, _check_index(i, self.grid.shape[1]))
+
+    def __iter__(self):
+        for i in range(self.grid.shape[1]):
+            yield _Row(self.grid, self.z, i)
+
+
+class _Row:
+    def __init__(self, grid, z, i):
+        self.grid = grid
+        self.z = z
+        self.i = i
+
+    def __len__(self):
+        return self.grid.shape[2]
+
+    def __getitem__(self, j):
+        return self.grid.get((self.z, self.i, _check_index(j, self.grid.shape[2])))
+
+    def __setitem__(self, j, value):
+        self.grid.set((self.z, self.i, _check_index(j, self.grid.shape[2])), value)
+
+    def __bytes__(self):
+        return self.grid.row_bytes(self.z, self.i)
+
+    def __iter__(self):
+        return iter(self.grid.row_bytes(self.z, self.i))
@@ -3,6 +3,8 @@ from tkinter import messagebox
 from tkinter import ttk
 from utils.game_helpers import TrafficPuzzleBoard
 from utils.ai_algorithms import solve_traffic_puzzle
+from utils.traffic_state import METRICS
+from utils.traffic_db import TrafficDatabase
 
 def get_initial_board(difficulty="easy"):
     if difficulty == "easy":
@@ -55,9 +57,20 @@ class TrafficPuzzleApp:
         self.algorithm_var = tk.StringVar(value="A*")
         ttk.Combobox(controls_frame, textvariable=self.algorithm_var, values=["A*", "BFS", "DFS"], width=8).grid(row=0, column=3)
 
+        # Cost metric
+        tk.Label(controls_frame, text="Cost:").grid(row=0, column=4, padx=5)
+        self.metric_var = tk.StringVar(value=METRICS[0])
+        ttk.Combobox(controls_frame, textvariable=self.metric_var, values=list(METRICS), width=11).grid(row=0, column=5)
+
         # Animation toggle
         self.animate_var = tk.BooleanVar(value=True)
-        tk.Checkbutton(controls_frame, text="Animate", variable=self.animate_var).grid(row=0, column=4, padx=10)
+        tk.Checkbutton(controls_frame, text="Animate", variable=self.animate_var).grid(row=0, column=6, padx=10)
+
+        # Distance table for A*: the first solve of a board stores its whole
+        # state cluster on disk, and every later solve in that cluster is a lookup
+        self.database = TrafficDatabase()
+        self.table_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(controls_frame, text="Lookup table", variable=self.table_var).grid(row=0, column=7)
 
         # Puzzle board
         self.board_frame = tk.Frame(self.root)
@@ -86,7 +99,14 @@ class TrafficPuzzleApp:
         animate = self.animate_var.get()
         board_state = self.board.get_board()
 
-        solution = solve_traffic_puzzle(board_state, algorithm=algorithm)
+        database = None
+        if self.table_var.get() and algorithm == "A*":
+            try:
+                self.database.precompute(board_state)
+                database = self.database
+            except (ValueError, OSError):
+                pass  # Untabulable board or unwritable cache; search instead
+        solution = solve_traffic_puzzle(board_state, algorithm=algorithm, metric=self.metric_var.get(), database=database)
         if solution:
             self.board.animate_solution(solution, animate=animate)
         else:
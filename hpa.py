@@ -0,0 +1,192 @@
+from collections import deque
+from itertools import product
+
+
+class ClusterHierarchy:
+    # Abstract graph for hierarchical pathfinding (HPA*) over a FlatGrid. The
+    # grid is cut into blocks of cluster_size cells per axis. Where two blocks
+    # touch, every run of open cell pairs across the border becomes an
+    # entrance: its middle pair, or both end pairs of a long run. Each block
+    # stores walking distances between its own entrance cells. Blocks are
+    # built the first time a search reaches them, and an edit only drops the
+    # block it falls in and the borders the cell lies on.
+    long_run = 6
+
+    def __init__(self, grid, cluster_size=16):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.shape = grid.shape
+        self.counts = tuple(-(-extent // cluster_size) for extent in self.shape)
+        self.borders = {}  # (cluster, axis) -> entrance pairs towards cluster + 1 along axis
+        self.crossings = {}  # node -> entrance nodes one step away across a border
+        self.edges = {}  # cluster -> {node: {node: distance}} between its entrances
+
+    def cluster_at(self, position):
+        size = self.cluster_size
+        return tuple(coord // size for coord in position)
+
+    def cluster_of(self, node):
+        return self.cluster_at(self.grid.position(node))
+
+    def bounds(self, cluster):
+        size = self.cluster_size
+        return [(c * size, min((c + 1) * size, extent)) for c, extent in zip(cluster, self.shape)]
+
+    def members(self, cluster):
+        # Node IDs of every cell in the cluster, open or not
+        *outer, (lo, hi) = self.bounds(cluster)
+        nodes = set()
+        for prefix in product(*(range(a, b) for a, b in outer)):
+            base = self.grid.index(prefix + (lo,))
+            nodes.update(range(base, base + hi - lo))
+        return nodes
+
+    def _border_keys(self, cluster):
+        for axis, coord in enumerate(cluster):
+            if coord > 0:
+                yield cluster[:axis] + (coord - 1,) + cluster[axis + 1:], axis
+            if coord + 1 < self.counts[axis]:
+                yield cluster, axis
+
+    def _build_border(self, key):
+        cluster, axis = key
+        grid, cells = self.grid, self.grid.cells
+        bounds = self.bounds(cluster)
+        across = grid.strides[axis]
+        # Lines run along the innermost axis of the border face
+        line_axis = len(bounds) - 1 if axis != len(bounds) - 1 else len(bounds) - 2
+        line_step = grid.strides[line_axis]
+        length = bounds[line_axis][1] - bounds[line_axis][0]
+        ranges = [range(lo, hi) for lo, hi in bounds]
+        ranges[axis] = range(bounds[axis][1] - 1, bounds[axis][1])
+        ranges[line_axis] = range(bounds[line_axis][0], bounds[line_axis][0] + 1)
+
+        pairs = []
+        for position in product(*ranges):
+            line = grid.index(position)
+            run = 0
+            for k in range(length + 1):
+                node = line + k * line_step
+                if k < length and cells[node] == 0 and cells[node + across] == 0:
+                    run += 1
+                    continue
+                if run:
+                    first, last = node - run * line_step, node - line_step
+                    if run >= self.long_run:
+                        ends = (first, last)
+                    else:
+                        ends = (first + run // 2 * line_step,)
+                    pairs.extend((end, end + across) for end in ends)
+                    run = 0
+
+        for a, b in pairs:
+            self.crossings.setdefault(a, set()).add(b)
+            self.crossings.setdefault(b, set()).add(a)
+        self.borders[key] = pairs
+
+    def _drop_border(self, key):
+        pairs = self.borders.pop(key, None)
+        if pairs is None:
+            return
+        for a, b in pairs:
+            for node, other in ((a, b), (b, a)):
+                crossing = self.crossings[node]
+                crossing.discard(other)
+                if not crossing:
+                    del self.crossings[node]
+        # Both sides lose or gain entrance cells
+        cluster, axis = key
+        self.edges.pop(cluster, None)
+        self.edges.pop(cluster[:axis] + (cluster[axis] + 1,) + cluster[axis + 1:], None)
+
+    def build(self, cluster):
+        if cluster in self.edges:
+            return self.edges[cluster]
+        entrances = set()
+        for key in self._border_keys(cluster):
+            if key not in self.borders:
+                self._build_border(key)
+            side = 0 if key[0] == cluster else 1
+            entrances.update(pair[side] for pair in self.borders[key])
+
+        members = self.members(cluster)
+        edges = {}
+        for node in entrances:
+            dist, _ = self.flood(node, members)
+            edges[node] = {other: dist[other] for other in entrances if other != node and other in dist}
+        self.edges[cluster] = edges
+        return edges
+
+    def flood(self, source, members, target=None):
+        # Unit-cost BFS confined to one cluster's cells, stopping at target
+        neighbors = self.grid.neighbors
+        dist = {source: 0}
+        came_from = {source: source}
+        queue = deque([source])
+        while queue and target not in dist:
+            current = queue.popleft()
+            next_dist = dist[current] + 1
+            for neighbor in neighbors(current):
+                if neighbor in members and neighbor not in dist:
+                    dist[neighbor] = next_dist
+                    came_from[neighbor] = current
+                    queue.append(neighbor)
+        return dist, came_from
+
+    def connect(self, source, target):
+        # Temporary edges from source to its cluster's entrances, and from the
+        # target cluster's entrances to target; like the other solvers a
+        # blocked source may still move out, but a blocked target is never entered
+        links = {}
+        cluster = self.cluster_of(source)
+        entrances = self.build(cluster)
+        dist, _ = self.flood(source, self.members(cluster))
+        links[source] = {node: dist[node] for node in entrances if node in dist}
+        if self.grid.cells[target]:
+            return links
+        if self.cluster_of(target) == cluster and target in dist:
+            links[source][target] = dist[target]
+
+        cluster = self.cluster_of(target)
+        entrances = self.build(cluster)
+        dist, _ = self.flood(target, self.members(cluster))
+        for node in entrances:
+            if node in dist:
+                links.setdefault(node, {})[target] = dist[node]
+        return links
+
+    def edges_from(self, node, links):
+        # (neighbor, cost) pairs of an abstract node, building its cluster on first visit
+        edges = self.build(self.cluster_of(node)).get(node)
+        if edges:
+            yield from edges.items()
+        for other in self.crossings.get(node, ()):
+            yield other, 1
+        extra = links.get(node)
+        if extra:
+            yield from extra.items()
+
+    def refine(self, nodes):
+        # Expand an abstract path into cells, one cluster-bounded BFS per leg
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            if b in self.crossings.get(a, ()):
+                path.append(b)
+                continue
+            _, came_from = self.flood(a, self.members(self.cluster_of(a)), b)
+            leg = [b]
+            while leg[-1] != a:
+                leg.append(came_from[leg[-1]])
+            leg.reverse()
+            path.extend(leg[1:])
+        return path
+
+    def update_cell(self, maze, position, blocked):
+        # The FlatGrid holds the cells; only cached entrances need dropping
+        cluster = self.cluster_at(position)
+        self.edges.pop(cluster, None)
+        for axis, (lo, hi) in enumerate(self.bounds(cluster)):
+            if position[axis] == lo and cluster[axis] > 0:
+                self._drop_border((cluster[:axis] + (cluster[axis] - 1,) + cluster[axis + 1:], axis))
+            if position[axis] == hi - 1 and cluster[axis] + 1 < self.counts[axis]:
+                self._drop_border((cluster, axis))
@@ -0,0 +1,307 @@
+from array import array
+from collections import deque
+
+GENERATORS = ("kruskal", "backtracker", "eller")
+
+
+class RoomLattice:
+    # Perfect mazes on blocked-cell grids: rooms sit on the cells whose
+    # coordinates are all even and the odd cell between two neighboring
+    # rooms is the passage that joins them. Room slots are indexed over a
+    # lattice padded by one absent room per side, like FlatGrid. On hex grids
+    # passages around a room also touch diagonally, leaving small corner loops.
+    def __init__(self, shape, wrapping_axes=()):
+        self.shape = tuple(shape)
+        # A wrapping axis of odd extent would put two rooms side by side
+        # across the seam, so its last cell is left out of the lattice
+        self.room_shape = tuple(extent // 2 if axis in wrapping_axes else (extent + 1) // 2
+                                for axis, extent in enumerate(self.shape))
+
+        self.cell_strides, self.steps = [], []
+        cell_stride = room_stride = 1
+        for extent, rooms in zip(reversed(self.shape), reversed(self.room_shape)):
+            self.cell_strides.append(cell_stride)
+            self.steps.append(room_stride)
+            cell_stride *= extent
+            room_stride *= rooms + 2
+        self.cell_strides.reverse()
+        self.steps.reverse()
+        self.num_cells = cell_stride
+        self.num_slots = room_stride
+
+        # Cell index of every room slot, -1 on the padding; rooms along the
+        # last axis are contiguous slots two cells apart, so fill row by row
+        row_rooms = self.room_shape[-1]
+        self.room_cells = array('i', [-1]) * self.num_slots
+        self.row_starts = []
+        for prefix in self._prefixes():
+            slot = sum((coord + 1) * step for coord, step in zip(prefix, self.steps)) + self.steps[-1]
+            cell = sum(2 * coord * stride for coord, stride in zip(prefix, self.cell_strides))
+            self.room_cells[slot:slot + row_rooms] = array('i', range(cell, cell + 2 * row_rooms, 2))
+            self.row_starts.append((slot, cell))
+
+        # Edges across the seam of a wrapping axis, with their passage cells
+        self.wrap_neighbors = {}
+        self.wrap_passages = {}
+        for axis in wrapping_axes:
+            rooms = self.room_shape[axis]
+            if self.shape[axis] % 2 or rooms < 2:
+                continue
+            for slot in self.slots():
+                coord = slot // self.steps[axis] % (rooms + 2) - 1
+                if coord == rooms - 1:
+                    other = slot - (rooms - 1) * self.steps[axis]
+                    passage = self.room_cells[slot] + self.cell_strides[axis]
+                    self.wrap_neighbors.setdefault(slot, []).append(other)
+                    self.wrap_neighbors.setdefault(other, []).append(slot)
+                    self.wrap_passages[slot, other] = self.wrap_passages[other, slot] = passage
+
+    def _prefixes(self):
+        prefixes = [()]
+        for rooms in self.room_shape[:-1]:
+            prefixes = [prefix + (coord,) for prefix in prefixes for coord in range(rooms)]
+        return prefixes
+
+    def slots(self):
+        row_rooms = self.room_shape[-1]
+        for slot, _ in self.row_starts:
+            yield from range(slot, slot + row_rooms)
+
+    def passage(self, room, other):
+        cell = self.wrap_passages.get((room, other))
+        if cell is None:
+            cell = (self.room_cells[room] + self.room_cells[other]) >> 1
+        return cell
+
+    def open_rooms(self, cells):
+        row_rooms = self.room_shape[-1]
+        for _, cell in self.row_starts:
+            cells[cell:cell + 2 * row_rooms - 1:2] = bytes(row_rooms)
+
+
+def carve_perfect_maze(shape, wrapping_axes, get_adjacent, endpoints, generator, rng):
+    # Returns a nested 0/1 grid whose open cells form a tree, with every
+    # endpoint attached to it; runs in time linear in the number of cells
+    lattice = RoomLattice(shape, wrapping_axes)
+    cells = bytearray(b'\x01') * lattice.num_cells
+
+    if generator == "kruskal":
+        _kruskal(lattice, cells, rng)
+    elif generator == "backtracker":
+        _backtracker(lattice, cells, rng)
+    elif generator == "eller":
+        _eller(lattice, cells, rng)
+    else:
+        raise ValueError(f"Unknown maze generator: {generator}")
+    lattice.open_rooms(cells)
+
+    endpoints = [tuple(position) for position in endpoints]
+    for position in endpoints:
+        _attach(cells, lattice.cell_strides, get_adjacent, position, endpoints)
+    return _nest(cells, lattice.shape)
+
+
+def _kruskal(lattice, cells, rng):
+    # Union-find over room slots, joining rooms across a shuffled edge list.
+    # Edge e < base is slot e // axes and its neighbor along axis e % axes.
+    steps, room_cells, passage = lattice.steps, lattice.room_cells, lattice.passage
+    axes = len(steps)
+    edges = array('q')
+    for axis, step in enumerate(steps):
+        edges.extend(slot * axes + axis for slot in lattice.slots() if room_cells[slot + step] >= 0)
+    wrap_edges = [pair for pair in lattice.wrap_passages if pair[0] < pair[1]]
+    base = lattice.num_slots * axes
+    edges.extend(range(base, base + len(wrap_edges)))
+    _shuffle(edges, rng)
+
+    parent = array('i', range(lattice.num_slots))
+    rank = bytearray(lattice.num_slots)
+    for edge in edges:
+        if edge >= base:
+            room, other = wrap_edges[edge - base]
+        else:
+            room, axis = divmod(edge, axes)
+            other = room + steps[axis]
+
+        root = room
+        while parent[root] != root:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        other_root = other
+        while parent[other_root] != other_root:
+            parent[other_root] = parent[parent[other_root]]
+            other_root = parent[other_root]
+
+        if root != other_root:
+            if rank[root] > rank[other_root]:
+                root, other_root = other_root, root
+            elif rank[root] == rank[other_root]:
+                rank[other_root] += 1
+            parent[root] = other_root
+            if edge >= base:
+                cells[passage(room, other)] = 0
+            else:
+                cells[(room_cells[room] + room_cells[other]) >> 1] = 0
+
+
+def _backtracker(lattice, cells, rng):
+    # Randomized depth-first search with an explicit stack of room slots
+    room_cells, wrap_neighbors, passage = lattice.room_cells, lattice.wrap_neighbors, lattice.passage
+    directions = [sign * step for step in lattice.steps for sign in (-1, 1)]
+    random = rng.random
+    visited = bytearray(b'\x01') * lattice.num_slots
+    row_rooms = lattice.room_shape[-1]
+    for slot, _ in lattice.row_starts:
+        visited[slot:slot + row_rooms] = bytes(row_rooms)
+
+    root = lattice.row_starts[0][0]
+    visited[root] = 1
+    stack = [root]
+    while stack:
+        room = stack[-1]
+        options = [room + step for step in directions if not visited[room + step]]
+        if wrap_neighbors:
+            options.extend(other for other in wrap_neighbors.get(room, ()) if not visited[other])
+        if not options:
+            stack.pop()
+            continue
+        other = options[int(random() * len(options))]
+        visited[other] = 1
+        if wrap_neighbors:
+            cells[passage(room, other)] = 0
+        else:
+            cells[(room_cells[room] + room_cells[other]) >> 1] = 0
+        stack.append(other)
+
+
+def _eller(lattice, cells, rng):
+    # Eller's algorithm along the first axis: only the set labels of the
+    # current row of rooms are kept. Rows of higher-dimensional lattices are
+    # whole layers, joined in shuffled order rather than left to right.
+    steps, room_cells, wrap_neighbors = lattice.steps, lattice.room_cells, lattice.wrap_neighbors
+    passage = lattice.passage
+    random = rng.random
+    down = steps[0]
+    rows = lattice.room_shape[0]
+    row_rooms = lattice.room_shape[-1]
+    lines = len(lattice.row_starts) // rows
+    labels = {}
+    next_label = 0
+
+    for row in range(rows):
+        members = [slot for start, _ in lattice.row_starts[row * lines:(row + 1) * lines]
+                   for slot in range(start, start + row_rooms)]
+        last = row == rows - 1
+        for room in members:
+            if room not in labels:
+                labels[room] = next_label
+                next_label += 1
+
+        edges = [(room, room + step) for room in members for step in steps[1:]
+                 if room_cells[room + step] >= 0]
+        edges.extend((room, other) for room in members for other in wrap_neighbors.get(room, ())
+                     if room < other)
+        if lines > 1:
+            _shuffle(edges, rng)
+
+        parent = {}
+        for room, other in edges:
+            root = labels[room]
+            while root in parent:
+                root = parent[root]
+            other_root = labels[other]
+            while other_root in parent:
+                other_root = parent[other_root]
+            if root != other_root and (last or random() < 0.5):
+                parent[root] = other_root
+                cells[passage(room, other)] = 0
+
+        if last:
+            break
+
+        # Every set continues into the next row through at least one room
+        groups = {}
+        for room in members:
+            root = labels[room]
+            while root in parent:
+                root = parent[root]
+            groups.setdefault(root, []).append(room)
+        labels = {}
+        for label, rooms in groups.items():
+            first = int(random() * len(rooms))
+            for k, room in enumerate(rooms):
+                if k == first or random() < 0.3:
+                    labels[room + down] = label
+                    cells[(room_cells[room] + room_cells[room + down]) >> 1] = 0
+
+
+def _shuffle(items, rng):
+    # Fisher-Yates on rng.random(), a good deal quicker than rng.shuffle
+    random = rng.random
+    for i in range(len(items) - 1, 0, -1):
+        j = int(random() * (i + 1))
+        items[i], items[j] = items[j], items[i]
+
+
+def _attach(cells, strides, get_adjacent, position, keep):
+    # Open a corridor from position to the nearest carved cell, only through
+    # cells that touch nothing open so the maze stays a tree. An endpoint
+    # wedged between open cells is opened and the loops that closes are cut
+    # again elsewhere.
+    def index(cell):
+        return sum(coord * stride for coord, stride in zip(cell, strides))
+
+    def open_around(cell):
+        return [other for other in get_adjacent(cell) if cells[index(other)] == 0]
+
+    if cells[index(position)] == 0:
+        return
+    came_from = {position: None}
+    queue = deque([position])
+    while queue:
+        current = queue.popleft()
+        touching = open_around(current)
+        if len(touching) == 1 or (touching and current == position):
+            while current is not None:
+                cells[index(current)] = 0
+                current = came_from[current]
+            for other in touching[1:]:
+                _cut_loop(cells, index, open_around, touching[0], other, position, keep)
+            return
+        if touching:
+            continue
+        for other in get_adjacent(current):
+            if other not in came_from:
+                came_from[other] = current
+                queue.append(other)
+
+
+def _cut_loop(cells, index, open_around, first, last, through, keep):
+    # Close one corridor cell on the tree path from first to last, which
+    # together with the freshly opened cell between them forms a loop
+    came_from = {first: None, through: None}
+    queue = deque([first])
+    while queue:
+        current = queue.popleft()
+        if current == last:
+            break
+        for other in open_around(current):
+            if other not in came_from:
+                came_from[other] = current
+                queue.append(other)
+
+    if last not in came_from:
+        return
+    current = last
+    while current is not None:
+        if current not in keep and len(open_around(current)) == 2:
+            cells[index(current)] = 1
+            return
+        current = came_from.get(current)
+
+
+def _nest(cells, shape):
+    if len(shape) == 1:
+        return list(cells)
+    step = len(cells) // shape[0]
+    return [_nest(cells[k * step:(k + 1) * step], shape[1:]) for k in range(shape[0])]
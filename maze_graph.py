@@ -0,0 +1,298 @@
+from array import array
+from itertools import product
+
+
+class FlatGrid:
+    # Byte-per-cell copy of a rectangular maze with a one-cell wall border,
+    # so neighbor lookups on int node IDs need no bounds checks
+    def __init__(self, shape, cells):
+        self.shape = tuple(shape)
+        self.cells = cells
+
+        # Row-major strides over the padded grid, outermost axis first
+        self.strides = []
+        stride = 1
+        for extent in reversed(self.shape):
+            self.strides.append(stride)
+            stride *= extent + 2
+        self.strides.reverse()
+        self.num_nodes = stride
+
+        # Same neighbor order as get_neighbors: rows, columns, then layers
+        row_stride, col_stride = self.strides[-2], self.strides[-1]
+        self.steps = (-row_stride, row_stride, -col_stride, col_stride)
+        if len(self.shape) == 3:
+            self.steps += (-self.strides[0], self.strides[0])
+
+    @classmethod
+    def from_maze(cls, maze):
+        shape = maze.get_dimensions()
+        # A memory-mapped maze already holds its cells in this padded layout
+        cells = getattr(maze.grid, 'padded_cells', None)
+        if cells is not None:
+            return cls(shape, cells)
+        grid = cls(shape, None)
+        cells = bytearray(b'\x01') * grid.num_nodes
+        copy_into = getattr(maze.grid, 'copy_into', None)
+        if copy_into is not None:
+            # Chunked storage copies chunk rows and skips all-wall chunks
+            copy_into(cells, grid.strides)
+            grid.cells = cells
+            return grid
+        cols = shape[-1]
+
+        if len(shape) == 2:
+            layers = [((), maze.grid)]
+        else:
+            layers = [((z,), layer) for z, layer in enumerate(maze.grid)]
+
+        for prefix, layer in layers:
+            for i, row in enumerate(layer):
+                base = grid.index(prefix + (i, 0))
+                cells[base:base + cols] = bytes(row)
+
+        grid.cells = cells
+        return grid
+
+    def index(self, position):
+        node = 0
+        for coord, stride in zip(position, self.strides):
+            node += (coord + 1) * stride
+        return node
+
+    def position(self, node):
+        coords = []
+        for stride in self.strides:
+            coord, node = divmod(node, stride)
+            coords.append(coord - 1)
+        return tuple(coords)
+
+    def neighbors(self, node):
+        cells = self.cells
+        return [node + step for step in self.steps if cells[node + step] == 0]
+
+    def heuristic_to(self, goal):
+        # Manhattan distance to a fixed goal, computed straight from node IDs
+        strides = self.strides
+        goal_coords = self.position(goal)
+
+        def heuristic(node):
+            total = 0
+            for stride, target in zip(strides, goal_coords):
+                coord, node = divmod(node, stride)
+                total += abs(coord - 1 - target)
+            return total
+
+        return heuristic
+
+    def reverse(self):
+        return ReversedFlatGrid(self.shape, self.cells)
+
+    def update_cell(self, maze, position, blocked):
+        # Reversed views share the cell buffer, so they see the edit too
+        self.cells[self.index(position)] = 1 if blocked else 0
+
+
+class ReversedFlatGrid(FlatGrid):
+    # Edges into open cells come from every adjacent cell, blocked or not
+    def neighbors(self, node):
+        if self.cells[node]:
+            return []
+        return [node + step for step in self.steps]
+
+    def reverse(self):
+        return FlatGrid(self.shape, self.cells)
+
+
+class MazeGraph:
+    # Compressed-sparse-row adjacency of any maze: the open neighbors of node
+    # n are targets[offsets[n]:offsets[n + 1]], and node IDs are row-major
+    # indices over maze.get_dimensions(). metric, when set, supplies the
+    # maze's own heuristic in place of plain Manhattan distance.
+    def __init__(self, shape, offsets, targets, metric=None):
+        self.shape = tuple(shape)
+        self.offsets = offsets
+        self.targets = targets
+        self.metric = metric
+        self.num_nodes = len(offsets) - 1
+        self._patches = {}
+
+        self.strides = []
+        stride = 1
+        for extent in reversed(self.shape):
+            self.strides.append(stride)
+            stride *= extent
+        self.strides.reverse()
+
+    @classmethod
+    def compile(cls, maze):
+        shape = maze.get_dimensions()
+        graph = cls(shape, array('i', [0]), array('i'), maze.get_heuristic())
+        get_neighbors = maze.get_neighbors
+        offsets, targets = graph.offsets, graph.targets
+        positions = product(*(range(extent) for extent in shape))
+
+        # Run every bounds check, wraparound and parity branch exactly once
+        if len(shape) == 2:
+            row_stride = graph.strides[0]
+            for position in positions:
+                targets.extend([i * row_stride + j for i, j in get_neighbors(position)])
+                offsets.append(len(targets))
+        else:
+            layer_stride, row_stride = graph.strides[0], graph.strides[1]
+            for position in positions:
+                targets.extend([z * layer_stride + i * row_stride + j
+                                for z, i, j in get_neighbors(position)])
+                offsets.append(len(targets))
+
+        graph.num_nodes = len(offsets) - 1
+        return graph
+
+    @classmethod
+    def from_flat_grid(cls, flat, metric=None):
+        # The graph compile() builds for a rectangular maze, read straight off
+        # a FlatGrid's padded cell bytes instead of a get_neighbors call per cell
+        graph = cls(flat.shape, array('i', [0]), array('i'), metric)
+        cells, offsets, targets = flat.cells, graph.offsets, graph.targets
+        row_stride, col_stride = graph.strides[-2], graph.strides[-1]
+        moves = (-row_stride, row_stride, -col_stride, col_stride)
+        if len(flat.shape) == 3:
+            moves += (-graph.strides[0], graph.strides[0])
+        # Each padded step paired with the same move between row-major IDs
+        steps = tuple(zip(flat.steps, moves))
+
+        node = 0
+        cols = flat.shape[-1]
+        for prefix in product(*(range(extent) for extent in flat.shape[:-1])):
+            padded = flat.index(prefix + (0,))
+            for cell in range(padded, padded + cols):
+                targets.extend([node + move for step, move in steps if not cells[cell + step]])
+                offsets.append(len(targets))
+                node += 1
+
+        graph.num_nodes = len(offsets) - 1
+        return graph
+
+    def index(self, position):
+        node = 0
+        for coord, stride in zip(position, self.strides):
+            node += coord * stride
+        return node
+
+    def position(self, node):
+        coords = []
+        for stride in self.strides:
+            coord, node = divmod(node, stride)
+            coords.append(coord)
+        return tuple(coords)
+
+    def neighbors(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def heuristic_to(self, goal):
+        if self.metric is not None:
+            return self.metric.heuristic_to(self, goal)
+        # Manhattan distance over raw coordinates, like the tuple heuristics
+        strides = self.strides
+        goal_coords = self.position(goal)
+
+        def heuristic(node):
+            total = 0
+            for stride, target in zip(strides, goal_coords):
+                coord, node = divmod(node, stride)
+                total += abs(coord - target)
+            return total
+
+        return heuristic
+
+    def reverse(self):
+        # Transposed CSR, built by counting in-degrees and filling in place
+        if getattr(self, '_reverse', None) is None:
+            neighbors = self.neighbors
+            counts = [0] * (self.num_nodes + 1)
+            for node in range(self.num_nodes):
+                for target in neighbors(node):
+                    counts[target + 1] += 1
+            for node in range(self.num_nodes):
+                counts[node + 1] += counts[node]
+
+            reverse_offsets = array('i', counts)
+            reverse_targets = array('i', [0]) * counts[-1]
+            for node in range(self.num_nodes):
+                for target in neighbors(node):
+                    reverse_targets[counts[target]] = node
+                    counts[target] += 1
+
+            self._reverse = MazeGraph(self.shape, reverse_offsets, reverse_targets, self.metric)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def update_cell(self, maze, position, blocked):
+        # Only edges into the edited cell change: the cells around it gain or
+        # lose it as a neighbor, and its own neighbor list stays the same
+        node = self.index(position)
+        adjacent = maze.get_adjacent(position)
+        for cell in adjacent:
+            self._patch(self.index(cell), [self.index(p) for p in maze.get_neighbors(cell)])
+        if getattr(self, '_reverse', None) is not None:
+            sources = [] if blocked else [self.index(cell) for cell in adjacent]
+            self._reverse._patch(node, sources)
+
+    def _patch(self, node, targets):
+        # Patched lists shadow the CSR slices, so the arrays are never rebuilt;
+        # unpatched graphs keep the plain slicing neighbors()
+        if not self._patches:
+            self.neighbors = self._patched_neighbors
+        self._patches[node] = array('i', targets)
+
+    def _patched_neighbors(self, node):
+        targets = self._patches.get(node)
+        if targets is None:
+            return self.targets[self.offsets[node]:self.offsets[node + 1]]
+        return targets
+
+
+class PolarDistance:
+    # Ring steps plus sector steps the shorter way round the circle, for
+    # (ring, sector) grids whose sectors wrap
+    def heuristic_to(self, graph, goal):
+        sectors = graph.strides[0]
+        goal_ring, goal_sector = divmod(goal, sectors)
+
+        def heuristic(node):
+            ring, sector = divmod(node, sectors)
+            turn = abs(sector - goal_sector)
+            return abs(ring - goal_ring) + min(turn, sectors - turn)
+
+        return heuristic
+
+
+class HexDistance:
+    # Moves on an odd-q hex grid (odd columns sit half a cell lower), taken
+    # in cube coordinates x = j, z = i - (j - (j & 1)) / 2
+    def heuristic_to(self, graph, goal):
+        cols = graph.strides[0]
+        goal_i, goal_j = divmod(goal, cols)
+        goal_z = goal_i - (goal_j - (goal_j & 1)) // 2
+
+        def heuristic(node):
+            i, j = divmod(node, cols)
+            dx = j - goal_j
+            dz = i - (j - (j & 1)) // 2 - goal_z
+            return max(abs(dx), abs(dz), abs(dx + dz))
+
+        return heuristic
+
+
+def trace_path(came_from, node):
+    # Follow parent pointers back to the root, which is marked with -1
+    path = []
+    while node >= 0:
+        path.append(node)
+        node = came_from[node]
+    path.reverse()
+    return path
+
+
+def node_array(size, fill=-1):
+    return array('i', [fill]) * size
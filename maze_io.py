@@ -0,0 +1,142 @@
+import mmap
+import struct
+from maze_graph import FlatGrid
+from maze_types import MazeFactory, RectangularMaze2D, RectangularMaze3D, CircularMaze, HexagonalMaze
+
+# File layout, little-endian:
+#   header   magic, version, topology, ndim, flags, size, seed, generator name
+#   shape    ndim x u32, then start and goal as ndim x u32 each
+#   payload  at PAYLOAD_ALIGN: one byte per cell (0 open, 1 wall) over the
+#            grid padded by a wall cell on every side, i.e. FlatGrid.cells
+MAGIC = b'MAZE'
+VERSION = 1
+PAYLOAD_ALIGN = 64
+HEADER = struct.Struct('<4sHBBBIq16s')
+TOPOLOGIES = {"2D": 1, "3D": 2, "Circular": 3, "Hexagonal": 4}
+FLAG_SEED = 1
+FLAG_FLAT = 2
+
+
+class MappedGrid:
+    # Nested-index view (grid[i][j], grid[z][i][j]) over a padded cell buffer,
+    # so a maze loaded from disk reads and writes the mapped pages directly
+    def __init__(self, cells, shape, offset=None, strides=None):
+        self.cells = cells
+        self.shape = tuple(shape)
+        if strides is None:
+            # Top-level view over the whole payload, which FlatGrid can adopt
+            strides = []
+            stride = 1
+            for extent in reversed(self.shape):
+                strides.append(stride)
+                stride *= extent + 2
+            strides.reverse()
+            offset = sum(strides)
+            self.padded_cells = cells
+        self.offset = offset
+        self.strides = tuple(strides)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += self.shape[0]
+        if not 0 <= k < self.shape[0]:
+            raise IndexError("grid index out of range")
+        start = self.offset + k * self.strides[0]
+        if len(self.shape) == 2:
+            return self.cells[start:start + self.shape[1]]
+        return MappedGrid(self.cells, self.shape[1:], start, self.strides[1:])
+
+    def __iter__(self):
+        for k in range(self.shape[0]):
+            yield self[k]
+
+    def get(self, position):
+        return self.cells[self.offset + sum(coord * stride for coord, stride in zip(position, self.strides))]
+
+    def tolist(self):
+        if len(self.shape) == 2:
+            return [list(row) for row in self]
+        return [layer.tolist() for layer in self]
+
+    def __reduce__(self):
+        # Mapped buffers cannot be pickled; ship plain nested lists instead
+        return (list, (self.tolist(),))
+
+
+def maze_type_of(maze):
+    if isinstance(maze, RectangularMaze3D):
+        return "3D"
+    elif isinstance(maze, RectangularMaze2D):
+        return "2D"
+    elif isinstance(maze, CircularMaze):
+        return "Circular"
+    elif isinstance(maze, HexagonalMaze):
+        return "Hexagonal"
+    else:
+        raise ValueError(f"Cannot save maze of type {type(maze).__name__}")
+
+
+def save_maze(maze, path):
+    maze_type = maze_type_of(maze)
+    shape = maze.get_dimensions()
+    seed = getattr(maze, 'seed', None)
+    if seed is not None and not isinstance(seed, int):
+        raise ValueError("Only integer seeds can be saved")
+    generator = getattr(maze, 'generator', None) or ""
+
+    flags = (FLAG_SEED if seed is not None else 0) | (FLAG_FLAT if getattr(maze, 'flat', False) else 0)
+    header = HEADER.pack(MAGIC, VERSION, TOPOLOGIES[maze_type], len(shape), flags,
+                         maze.size, seed or 0, generator.encode('ascii'))
+    positions = tuple(shape) + tuple(maze.get_start_position()) + tuple(maze.get_goal_position())
+    header += struct.pack(f'<{len(positions)}I', *positions)
+    header += bytes(-len(header) % PAYLOAD_ALIGN)
+
+    cells = getattr(maze.grid, 'padded_cells', None)
+    if cells is None:
+        cells = FlatGrid.from_maze(maze).cells
+    with open(path, 'wb') as stream:
+        stream.write(header)
+        stream.write(cells)
+
+
+def load_maze(path, flat=None):
+    # The file is mapped copy-on-write: nothing is read up front, cells are
+    # paged in as solvers touch them, and set_cell edits stay in memory.
+    # flat overrides the stored choice of FlatGrid vs CSR for rectangular mazes.
+    with open(path, 'rb') as stream:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, topology, ndim, flags, size, seed, generator = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a maze file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported maze file version {version}")
+    maze_type = next((name for name, code in TOPOLOGIES.items() if code == topology), None)
+    if maze_type is None:
+        raise ValueError(f"Unknown maze topology code {topology}")
+
+    positions = struct.unpack_from(f'<{3 * ndim}I', mapped, HEADER.size)
+    shape, start, goal = positions[:ndim], positions[ndim:2 * ndim], positions[2 * ndim:]
+    offset = HEADER.size + 12 * ndim
+    offset += -offset % PAYLOAD_ALIGN
+    length = 1
+    for extent in shape:
+        length *= extent + 2
+    if len(mapped) < offset + length:
+        raise ValueError(f"{path} is truncated")
+
+    grid = MappedGrid(memoryview(mapped)[offset:offset + length], shape)
+    if flat is None:
+        flat = bool(flags & FLAG_FLAT)
+    maze = MazeFactory().create_maze(
+        maze_type, size, flat=flat and maze_type in ("2D", "3D"),
+        seed=seed if flags & FLAG_SEED else None,
+        generator=generator.rstrip(b'\0').decode('ascii') or None, grid=grid,
+        shape=shape if maze_type == "3D" else None)
+    if tuple(maze.get_dimensions()) != tuple(shape):
+        raise ValueError(f"Stored shape {shape} does not match a size-{size} {maze_type} maze")
+    maze.start, maze.goal = tuple(start), tuple(goal)
+    return maze
@@ -1,8 +1,85 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
+import multiprocessing
 from maze_types import MazeFactory
-from algorithms import AlgorithmFactory
+from algorithms import AlgorithmFactory, SearchStats
+
+COMPARISON_POLL_MS = 50
+
+# Per-process state for comparison workers; the maze arrives once per worker
+_worker_maze = None
+_worker_endpoints = None
+
+def _init_worker(maze, start, goal):
+    global _worker_maze, _worker_endpoints
+    _worker_maze = maze
+    _worker_endpoints = (start, goal)
+
+def _time_algorithm(algorithm):
+    solver = AlgorithmFactory().create_algorithm(algorithm)
+    start, goal = _worker_endpoints
+    start_time = time.perf_counter()
+    path = solver.solve(_worker_maze, start, goal)
+    elapsed = time.perf_counter() - start_time
+    
+    return {
+        'algorithm': algorithm,
+        'time': elapsed,
+        'path_length': len(path),
+        'solved': bool(path)
+    }
+
+class AlgorithmComparison:
+    # Runs each algorithm in its own worker process so a slow solver only
+    # delays its own row; stragglers past the timeout are killed with the pool
+    def __init__(self, maze, start, goal, algorithms, timeout):
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self.pool = context.Pool(len(algorithms), initializer=_init_worker,
+                                 initargs=(maze, start, goal))
+        self.timeout = timeout
+        self.started = time.perf_counter()
+        self.results = []
+        self.unreported = []
+        self.pending = {
+            algorithm: self.pool.apply_async(_time_algorithm, (algorithm,))
+            for algorithm in algorithms
+        }
+    
+    def collect(self):
+        # Return the rows that finished, timed out or were cancelled since the last call
+        timed_out = time.perf_counter() - self.started > self.timeout
+        for algorithm, job in list(self.pending.items()):
+            if job.ready():
+                try:
+                    result = job.get()
+                except Exception as e:
+                    result = self._failed(algorithm, "Error")
+                    result['error'] = str(e)
+            elif timed_out:
+                result = self._failed(algorithm, "Timed out")
+            else:
+                continue
+            del self.pending[algorithm]
+            self._finish(result)
+        
+        finished, self.unreported = self.unreported, []
+        return finished
+    
+    def cancel(self):
+        for algorithm in list(self.pending):
+            del self.pending[algorithm]
+            self._finish(self._failed(algorithm, "Cancelled"))
+    
+    def _finish(self, result):
+        self.results.append(result)
+        self.unreported.append(result)
+        if not self.pending:
+            self.pool.terminate()
+    
+    def _failed(self, algorithm, status):
+        return {'algorithm': algorithm, 'time': 0, 'path_length': 0, 'solved': False, 'status': status}
 
 class MazeSolverApp:
     def __init__(self, root):
@@ -17,6 +94,9 @@ class MazeSolverApp:
         self.start = None
         self.goal = None
         self.solution_path = None
+        self.comparison = None
+        self.animation = None
+        self.comparison_timeout = 30.0  # Seconds before a solver's row reads "Timed out"
         
         # UI Setup
         self.setup_ui()
@@ -43,17 +123,34 @@ class MazeSolverApp:
         # Algorithm
         ttk.Label(control_frame, text="Algorithm:").grid(row=1, column=0, sticky="w")
         self.algorithm_var = tk.StringVar(value="A*")
-        algorithms = ["A*", "Dijkstra", "Bidirectional BFS", "DFS", "Greedy Best-First"]
+        algorithms = ["A*", "Dijkstra", "Bidirectional BFS", "DFS", "Greedy Best-First", "Jump Point Search", "IDA*", "LPA*", "HPA*"]
         ttk.Combobox(control_frame, textvariable=self.algorithm_var, values=algorithms).grid(row=1, column=1, sticky="ew")
         
         # Size
         ttk.Label(control_frame, text="Maze Size:").grid(row=2, column=0, sticky="w")
         self.size_var = tk.IntVar(value=15)
-        ttk.Spinbox(control_frame, from_=5, to=50, textvariable=self.size_var).grid(row=2, column=1, sticky="ew")
+        ttk.Spinbox(control_frame, from_=5, to=500, textvariable=self.size_var).grid(row=2, column=1, sticky="ew")
+        
+        # Generator
+        ttk.Label(control_frame, text="Generator:").grid(row=3, column=0, sticky="w")
+        self.generator_var = tk.StringVar(value="Random")
+        generators = ["Random", "Kruskal", "Backtracker", "Eller"]
+        ttk.Combobox(control_frame, textvariable=self.generator_var, values=generators).grid(row=3, column=1, sticky="ew")
+        
+        # Playback speed in path steps per second
+        ttk.Label(control_frame, text="Speed:").grid(row=4, column=0, sticky="w")
+        self.speed_var = tk.IntVar(value=20)
+        ttk.Scale(control_frame, from_=1, to=500, variable=self.speed_var,
+                  command=self.change_speed).grid(row=4, column=1, sticky="ew")
         
         # Buttons
-        ttk.Button(control_frame, text="Generate Maze", command=self.generate_maze).grid(row=3, column=0, columnspan=2, sticky="ew", pady=5)
-        ttk.Button(control_frame, text="Solve", command=self.solve_maze).grid(row=4, column=0, columnspan=2, sticky="ew", pady=5)
+        ttk.Button(control_frame, text="Generate Maze", command=self.generate_maze).grid(row=5, column=0, columnspan=2, sticky="ew", pady=5)
+        ttk.Button(control_frame, text="Solve", command=self.solve_maze).grid(row=6, column=0, columnspan=2, sticky="ew", pady=5)
+        self.pause_button = ttk.Button(control_frame, text="Pause", command=self.toggle_pause)
+        self.pause_button.grid(row=7, column=0, columnspan=2, sticky="ew", pady=5)
+        self.explored_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Show explored cells",
+                        variable=self.explored_var).grid(row=8, column=0, columnspan=2, sticky="w")
         
         # Maze Display
         self.maze_frame = ttk.Frame(self.root, padding="10")
@@ -71,8 +168,11 @@ class MazeSolverApp:
         self.maze_size = self.size_var.get()
         
         try:
+            self.cancel_comparison()
+            generator = self.generator_var.get()
+            generator = None if generator == "Random" else generator.lower()
             factory = MazeFactory()
-            self.maze = factory.create_maze(self.maze_type, self.maze_size)
+            self.maze = factory.create_maze(self.maze_type, self.maze_size, generator=generator)
             self.start = self.maze.get_start_position()
             self.goal = self.maze.get_goal_position()
             self.solution_path = None
@@ -99,57 +199,58 @@ class MazeSolverApp:
             messagebox.showerror("Error", f"Failed to solve maze: {str(e)}")
     
     def solve_and_show(self, algorithm):
+        explored = []
+        stats = SearchStats(on_expand=explored.append) if self.explored_var.get() else None
         start_time = time.time()
         factory = AlgorithmFactory()
         solver = factory.create_algorithm(algorithm)
-        self.solution_path = solver.solve(self.maze, self.start, self.goal)
+        self.solution_path = solver.solve(self.maze, self.start, self.goal, stats=stats)
         elapsed = time.time() - start_time
         
+        # The scene is kept between solves: only cells entering or leaving
+        # the explored and path overlays are recolored
+        self.cancel_animation()
+        self.maze.set_overlay(self.maze_canvas, "explored", explored)
+        self.maze.set_overlay(self.maze_canvas, "path", [])
         if self.solution_path:
             self.status_var.set(f"Solved with {algorithm} in {elapsed:.4f} sec")
-            self.draw_maze()
             self.animate_solution()
         else:
             self.status_var.set(f"{algorithm} found no solution")
-            self.draw_maze()
     
     def compare_and_show_results(self, selected_algo):
-        results = []
         algorithms = ["A*", "Dijkstra", "Bidirectional BFS", "DFS", "Greedy Best-First"]
+        self.cancel_comparison()
         
-        for algo_name in algorithms:
-            try:
-                result = self.time_algorithm(algo_name)
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    'algorithm': algo_name,
-                    'time': 0,
-                    'path_length': 0,
-                    'solved': False,
-                    'error': str(e)
-                })
-
-        self.show_results(results, selected_algo)
+        # Compile the maze graph once so every worker receives it ready to search
+        self.maze.get_graph()
+        
+        self.comparison = AlgorithmComparison(self.maze, self.start, self.goal, algorithms,
+                                              timeout=self.comparison_timeout)
+        tree, results_window = self.show_results(self.comparison)
+        self.root.after(COMPARISON_POLL_MS, self.poll_comparison,
+                        self.comparison, tree, results_window, selected_algo)
     
-    def time_algorithm(self, algorithm):
-        start_time = time.time()
-        factory = AlgorithmFactory()
-        solver = factory.create_algorithm(algorithm)
-        path = solver.solve(self.maze, self.start, self.goal)
-        elapsed = time.time() - start_time
+    def poll_comparison(self, comparison, tree, results_window, selected_algo):
+        # Stream finished rows into the Treeview without blocking the Tk loop
+        for result in comparison.collect():
+            self.insert_result(tree, result, selected_algo)
         
-        return {
-            'algorithm': algorithm,
-            'time': elapsed,
-            'path_length': len(path) if path else 0,
-            'solved': path is not None
-        }
+        if comparison.pending:
+            self.root.after(COMPARISON_POLL_MS, self.poll_comparison,
+                            comparison, tree, results_window, selected_algo)
+        elif tree.winfo_exists():
+            self.show_summary(results_window, comparison.results)
+    
+    def cancel_comparison(self):
+        if self.comparison is not None:
+            self.comparison.cancel()
     
-    def show_results(self, results, selected_algo):
+    def show_results(self, comparison):
         results_window = tk.Toplevel(self.root)
         results_window.title("Algorithm Comparison")
         results_window.geometry("500x350")
+        results_window.protocol("WM_DELETE_WINDOW", lambda: self.close_results(results_window, comparison))
         
         frame = ttk.Frame(results_window)
         frame.pack(expand=True, fill='both', padx=10, pady=10)
@@ -160,19 +261,6 @@ class MazeSolverApp:
         tree.heading('Path Length', text='Path Length')
         tree.heading('Solved', text='Solved')
         
-        for result in results:
-            solved_text = "Yes" if result['solved'] else "No"
-            time_text = f"{result['time']:.4f}"
-            path_length = result['path_length'] if result['solved'] else "N/A"
-            tags = ('selected',) if result['algorithm'] == selected_algo else ()
-            
-            tree.insert('', 'end', values=(
-                result['algorithm'],
-                time_text,
-                path_length,
-                solved_text
-            ), tags=tags)
-        
         tree.tag_configure('selected', background='lightblue')
         tree.pack(expand=True, fill='both')
         
@@ -180,12 +268,7 @@ class MazeSolverApp:
         tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side='right', fill='y')
         
-        # Find fastest successful algorithm
-        successful = [r for r in results if r['solved']]
-        if successful:
-            fastest = min(successful, key=lambda x: x['time'])
-            summary = f"Fastest: {fastest['algorithm']} ({fastest['time']:.4f}s)"
-            ttk.Label(results_window, text=summary, font=('Helvetica', 10, 'bold')).pack(pady=5)
+        ttk.Button(results_window, text="Cancel", command=comparison.cancel).pack(pady=5)
         
         # Add visualization button
         ttk.Button(
@@ -193,6 +276,37 @@ class MazeSolverApp:
             text="Visualize Selected Algorithm",
             command=lambda: self.visualize_selected(tree)
         ).pack(pady=10)
+        
+        return tree, results_window
+    
+    def close_results(self, results_window, comparison):
+        comparison.cancel()
+        results_window.destroy()
+    
+    def insert_result(self, tree, result, selected_algo):
+        if not tree.winfo_exists():
+            return
+        
+        status = result.get('status')
+        solved_text = status if status else ("Yes" if result['solved'] else "No")
+        time_text = f"{result['time']:.4f}" if not status else "N/A"
+        path_length = result['path_length'] if result['solved'] else "N/A"
+        tags = ('selected',) if result['algorithm'] == selected_algo else ()
+        
+        tree.insert('', 'end', values=(
+            result['algorithm'],
+            time_text,
+            path_length,
+            solved_text
+        ), tags=tags)
+    
+    def show_summary(self, results_window, results):
+        # Find fastest successful algorithm
+        successful = [r for r in results if r['solved']]
+        if successful:
+            fastest = min(successful, key=lambda x: x['time'])
+            summary = f"Fastest: {fastest['algorithm']} ({fastest['time']:.4f}s)"
+            ttk.Label(results_window, text=summary, font=('Helvetica', 10, 'bold')).pack(pady=5)
     
     def visualize_selected(self, tree):
         selected = tree.focus()
@@ -201,6 +315,7 @@ class MazeSolverApp:
             self.solve_and_show(algo_name)
     
     def draw_maze(self):
+        self.cancel_animation()
         for widget in self.maze_frame.winfo_children():
             widget.destroy()
         canvas = self.maze.get_visualization(self.maze_frame)
@@ -209,7 +324,29 @@ class MazeSolverApp:
     
     def animate_solution(self):
         if self.solution_path and hasattr(self, 'maze_canvas'):
-            self.maze.animate_path(self.maze_canvas, self.solution_path)
+            self.cancel_animation()
+            self.animation = self.maze.animate_path(self.maze_canvas, self.solution_path,
+                                                    speed=self.speed_var.get())
+            self.pause_button.config(text="Pause")
+    
+    def cancel_animation(self):
+        if self.animation is not None:
+            self.animation.cancel()
+            self.animation = None
+    
+    def toggle_pause(self):
+        if self.animation is None or self.animation.finished:
+            return
+        if self.animation.paused:
+            self.animation.resume()
+            self.pause_button.config(text="Pause")
+        else:
+            self.animation.pause()
+            self.pause_button.config(text="Resume")
+    
+    def change_speed(self, value):
+        if self.animation is not None:
+            self.animation.set_speed(float(value))
 
 def run():
     root = tk.Tk()
@@ -2,8 +2,21 @@ import random
 import math
 import tkinter as tk
 from abc import ABC, abstractmethod
+from maze_graph import FlatGrid, MazeGraph, PolarDistance, HexDistance
+from bitboard import Bitboard
+from hpa import ClusterHierarchy
+from chunked_grid import ChunkedGrid
+from raster import GridRaster, HexRaster, PolarRaster, wants_raster
+from animation import PathAnimation
+from maze_generators import carve_perfect_maze
+
+# Overlay layers from bottom to top, with the color each gives its cells
+OVERLAYS = (("explored", "#c6dbef"), ("path", "lightgreen"))
+VIEW_STATE = ('_change_listeners', '_raster', '_cell_items', '_overlays')
 
 class Maze(ABC):
+    wrapping_axes = ()  # Axes whose last cell is adjacent to their first
+    
     @abstractmethod
     def get_start_position(self):
         pass
@@ -13,27 +26,159 @@ class Maze(ABC):
         pass
     
     @abstractmethod
-    def get_visualization(self, parent):
+    def get_visualization(self, parent, raster=None):
+        # raster=True draws the maze as one image, None decides by size
         pass
     
     @abstractmethod
-    def animate_path(self, canvas, path):
+    def paint_cell(self, canvas, cell, color):
+        # Recolor one cell of the retained visualization in place
         pass
     
     @abstractmethod
     def get_neighbors(self, position):
         pass
+    
+    @abstractmethod
+    def get_dimensions(self):
+        pass
+    
+    def animate_path(self, canvas, path, speed=20):
+        # Plays the path on a single timer at speed steps per second; the
+        # returned PathAnimation can be paused, re-timed or cancelled
+        animation = PathAnimation(canvas, path, lambda cells: self.draw_path_cells(canvas, cells), speed=speed)
+        return animation.start()
+    
+    def draw_path_cells(self, canvas, cells):
+        # One frame's batch of an animated path
+        self.add_to_overlay(canvas, "path", cells)
+    
+    def _reset_view(self):
+        # Scene state kept by get_visualization: canvas item per cell, or the
+        # image renderer, plus the cells under each overlay
+        self._raster = None
+        self._cell_items = {}
+        self._overlays = {}
+    
+    def cell_color(self, cell):
+        # How a cell looks with no overlay on it
+        if cell == self.start:
+            return "blue"
+        if cell == self.goal:
+            return "red"
+        value = self.grid
+        for coord in cell:
+            value = value[coord]
+        return "black" if value == 1 else "white"
+    
+    def shown_color(self, cell):
+        for name, color in reversed(OVERLAYS):
+            if cell in self._overlays.get(name, ()):
+                return color
+        return self.cell_color(cell)
+    
+    def set_overlay(self, canvas, name, cells):
+        # Replace one overlay; only cells entering or leaving it are repainted,
+        # so switching between two solutions costs O(path length), not O(cells)
+        old = self._overlays.get(name, set())
+        new = set(map(tuple, cells))
+        self._overlays[name] = new
+        self.repaint_cells(canvas, old ^ new)
+    
+    def add_to_overlay(self, canvas, name, cells):
+        overlay = self._overlays.setdefault(name, set())
+        added = [tuple(cell) for cell in cells if tuple(cell) not in overlay]
+        overlay.update(added)
+        self.repaint_cells(canvas, added)
+    
+    def repaint_cells(self, canvas, cells):
+        for cell in cells:
+            self.paint_cell(canvas, cell, self.shown_color(cell))
+    
+    def get_graph(self):
+        # Compiled once per maze and shared by every solver run on it
+        if getattr(self, '_graph', None) is None:
+            self._graph = self.compile_graph()
+        return self._graph
+    
+    def compile_graph(self):
+        return MazeGraph.compile(self)
+    
+    def get_heuristic(self):
+        # Admissible distance estimate for solvers, as a heuristic_to(graph,
+        # goal) provider; None keeps Manhattan distance, exact on open grids
+        return None
+    
+    def _build_grid(self, seed, generator, grid=None):
+        # Each maze draws from its own RNG, so a seed replays the exact instance.
+        # A prebuilt grid, e.g. one mapped from a maze file, skips generation.
+        self.seed = seed
+        self.generator = generator
+        if grid is not None:
+            return grid
+        rng = random.Random(seed)
+        if generator is None:
+            return self._generate_maze(rng)
+        return carve_perfect_maze(self.get_dimensions(), self.wrapping_axes, self.get_adjacent,
+                                  [self.start, self.goal], generator, rng)
+    
+    def set_cell(self, position, blocked):
+        # Edit one cell in place, patch the compiled graphs to match and
+        # notify change listeners such as an incremental solver
+        *outer, last = position
+        cells = self.grid
+        for coord in outer:
+            cells = cells[coord]
+        value = 1 if blocked else 0
+        if cells[last] == value:
+            return
+        cells[last] = value
+        
+        for graph in self._compiled_graphs():
+            graph.update_cell(self, position, blocked)
+        for listener in list(getattr(self, '_change_listeners', ())):
+            listener(position, blocked)
+    
+    def add_change_listener(self, listener):
+        # listener(position, blocked) runs after every effective set_cell
+        if getattr(self, '_change_listeners', None) is None:
+            self._change_listeners = []
+        self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener):
+        self._change_listeners.remove(listener)
+    
+    def _compiled_graphs(self):
+        graph = getattr(self, '_graph', None)
+        return [graph] if graph is not None else []
+    
+    def __getstate__(self):
+        # Widgets and scene state created by get_visualization and change
+        # listeners stay behind when the maze is pickled, e.g. to ship it to
+        # worker processes
+        state = {key: value for key, value in self.__dict__.items()
+                 if not isinstance(value, tk.Misc) and key not in VIEW_STATE}
+        if hasattr(self.grid, 'padded_cells'):
+            # A memory-mapped grid pickles as nested lists; graphs sharing its
+            # buffer are rebuilt on the other side
+            state.pop('_graph', None)
+            state.pop('_flat_grid', None)
+            state.pop('_hierarchy', None)
+        return state
 
 class RectangularMaze2D(Maze):
-    def __init__(self, size):
+    def __init__(self, size, flat=False, seed=None, generator=None, grid=None, packed=False):
         self.size = size
-        self.grid = self._generate_maze()
+        self.flat = flat  # Use a padded byte grid instead of CSR adjacency
+        self.packed = packed  # Store the cells as a one-bit-per-cell Bitboard
         self.start = (0, 0)
         self.goal = (size-1, size-1)
+        grid = self._build_grid(seed, generator, grid)
+        self.grid = Bitboard.from_grid(grid) if packed and isinstance(grid, list) else grid
         
-    def _generate_maze(self):
+    def _generate_maze(self, rng):
         # Generate a random 2D maze
-        grid = [[0 if random.random() < 0.7 else 1 for _ in range(self.size)] 
+        grid = [[0 if rng.random() < 0.7 else 1 for _ in range(self.size)] 
                 for _ in range(self.size)]
         
         # Ensure start and goal are open
@@ -47,43 +192,86 @@ class RectangularMaze2D(Maze):
     def get_goal_position(self):
         return self.goal
     
-    def get_visualization(self, parent):
-        cell_size = min(500 // self.size, 30)
+    def get_dimensions(self):
+        return (self.size, self.size)
+    
+    def get_flat_grid(self):
+        if getattr(self, '_flat_grid', None) is None:
+            self._flat_grid = FlatGrid.from_maze(self)
+        return self._flat_grid
+    
+    def get_bitboard(self):
+        # One bit per cell for bit-parallel connectivity and distance
+        # queries; a packed maze's grid already is one
+        if isinstance(self.grid, Bitboard):
+            return self.grid
+        if getattr(self, '_bitboard', None) is None:
+            self._bitboard = Bitboard.from_maze(self)
+        return self._bitboard
+    
+    def get_hierarchy(self, cluster_size=16):
+        # HPA* cluster graph, filled in as searches reach each cluster and
+        # kept in step with set_cell like the compiled graphs
+        hierarchy = getattr(self, '_hierarchy', None)
+        if hierarchy is None or hierarchy.cluster_size != cluster_size:
+            self._hierarchy = hierarchy = ClusterHierarchy(self.get_flat_grid(), cluster_size)
+        return hierarchy
+    
+    def is_reachable(self, start=None, goal=None):
+        return self.get_bitboard().is_reachable(start or self.start, goal or self.goal)
+    
+    def bfs_distance(self, start=None, goal=None):
+        # Fewest moves from start to goal, -1 if they are not connected
+        return self.get_bitboard().distance(start or self.start, goal or self.goal)
+    
+    def compile_graph(self):
+        # The flat byte grid needs no adjacency lists, only a copy of the cells
+        if self.flat:
+            return self.get_flat_grid()
+        # CSR is read off a padded byte copy, which the storage fills in bulk
+        flat_grid = getattr(self, '_flat_grid', None) or FlatGrid.from_maze(self)
+        return MazeGraph.from_flat_grid(flat_grid, self.get_heuristic())
+    
+    def _compiled_graphs(self):
+        graphs = super()._compiled_graphs()
+        flat_grid = getattr(self, '_flat_grid', None)
+        if flat_grid is not None and flat_grid is not getattr(self, '_graph', None):
+            graphs.append(flat_grid)
+        bitboard = getattr(self, '_bitboard', None)
+        if bitboard is not None:
+            graphs.append(bitboard)
+        hierarchy = getattr(self, '_hierarchy', None)
+        if hierarchy is not None:
+            graphs.append(hierarchy)
+        return graphs
+    
+    def get_visualization(self, parent, raster=None):
+        cell_size = max(1, min(500 // self.size, 30))
         canvas = tk.Canvas(parent, width=self.size*cell_size, height=self.size*cell_size)
         
+        self._reset_view()
+        if wants_raster(self.size * self.size, raster):
+            self._raster = GridRaster(self.size, self.size, cell_size)
+            self._raster.render(self.grid, {self.start: "blue", self.goal: "red"})
+            self._raster.attach(canvas)
+            return canvas
+        
+        # One item per cell, kept so later changes are a fill recolor
         for i in range(self.size):
             for j in range(self.size):
-                color = "black" if self.grid[i][j] == 1 else "white"
-                canvas.create_rectangle(
+                self._cell_items[i, j] = canvas.create_rectangle(
                     j*cell_size, i*cell_size,
                     (j+1)*cell_size, (i+1)*cell_size,
-                    fill=color, outline="gray"
+                    fill=self.cell_color((i, j)), outline="gray", tags="cell"
                 )
         
-        # Draw start and goal
-        start_i, start_j = self.start
-        goal_i, goal_j = self.goal
-        canvas.create_rectangle(
-            start_j*cell_size, start_i*cell_size,
-            (start_j+1)*cell_size, (start_i+1)*cell_size,
-            fill="blue", outline="gray"
-        )
-        canvas.create_rectangle(
-            goal_j*cell_size, goal_i*cell_size,
-            (goal_j+1)*cell_size, (goal_i+1)*cell_size,
-            fill="red", outline="gray"
-        )
-        
         return canvas
     
-    def animate_path(self, canvas, path):
-        cell_size = min(500 // self.size, 30)
-        for step, (i, j) in enumerate(path):
-            canvas.after(50 * step, lambda i=i, j=j: canvas.create_rectangle(
-                j*cell_size, i*cell_size,
-                (j+1)*cell_size, (i+1)*cell_size,
-                fill="lightgreen", outline="gray"
-            ))
+    def paint_cell(self, canvas, cell, color):
+        if self._raster is not None:
+            self._raster.paint(cell, color)
+        else:
+            canvas.itemconfig(self._cell_items[cell], fill=color)
     
     def get_neighbors(self, position):
         i, j = position
@@ -96,19 +284,48 @@ class RectangularMaze2D(Maze):
                 neighbors.append((ni, nj))
         
         return neighbors
+    
+    def get_adjacent(self, position):
+        # Every in-bounds cell one move away, walls or not
+        i, j = position
+        return [(i + di, j + dj) for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 <= i + di < self.size and 0 <= j + dj < self.size]
 
 class RectangularMaze3D(RectangularMaze2D):
-    def __init__(self, size):
+    def __init__(self, size, flat=False, seed=None, generator=None, grid=None, shape=None, packed=False):
         self.size = size
-        self.depth = 3  # Fixed 3 layers for simplicity
-        self.grid = self._generate_maze()
+        self.flat = flat
+        self.packed = packed
+        # (depth, rows, cols); three size x size layers unless given
+        self.depth, self.rows, self.cols = shape if shape is not None else (3, size, size)
         self.start = (0, 0, 0)
-        self.goal = (self.depth-1, size-1, size-1)
+        self.goal = (self.depth-1, self.rows-1, self.cols-1)
+        grid = self._build_grid(seed, generator, grid)
+        # Cells live in chunks, or in a Bitboard when packed; nested lists,
+        # e.g. from a generator, are converted
+        if packed and isinstance(grid, (list, ChunkedGrid)):
+            grid = Bitboard.from_grid(grid, self.get_dimensions())
+        elif isinstance(grid, list):
+            grid = ChunkedGrid.from_nested(grid)
+        self.grid = grid
+    
+    def _generate_maze(self, rng):
+        # Generate a 3D maze with layers, written straight into chunked storage
+        grid = ChunkedGrid(self.get_dimensions())
+        for z in range(self.depth):
+            for i in range(self.rows):
+                grid.set_row(z, i, bytes(0 if rng.random() < 0.7 else 1 for _ in range(self.cols)))
+        grid.compact()
+        return grid
     
-    def _generate_maze(self):
-        # Generate a 3D maze with layers
-        return [[[0 if random.random() < 0.7 else 1 for _ in range(self.size)] 
-                for _ in range(self.size)] for _ in range(self.depth)]
+    def __setstate__(self, state):
+        # A memory-mapped grid pickles as nested lists
+        self.__dict__.update(state)
+        if isinstance(self.grid, list):
+            if getattr(self, 'packed', False):
+                self.grid = Bitboard.from_grid(self.grid, self.get_dimensions())
+            else:
+                self.grid = ChunkedGrid.from_nested(self.grid)
     
     def get_start_position(self):
         return self.start
@@ -116,10 +333,13 @@ class RectangularMaze3D(RectangularMaze2D):
     def get_goal_position(self):
         return self.goal
     
-    def get_visualization(self, parent):
+    def get_dimensions(self):
+        return (self.depth, self.rows, self.cols)
+    
+    def get_visualization(self, parent, raster=None):
         # For simplicity, we'll show one layer at a time
         self.current_layer = 0
-        cell_size = min(500 // self.size, 30)
+        cell_size = max(1, min(500 // max(self.rows, self.cols), 30))
         
         frame = tk.Frame(parent)
         frame.pack(expand=True, fill="both")
@@ -133,43 +353,39 @@ class RectangularMaze3D(RectangularMaze2D):
         self.layer_label.pack(side="left")
         
         # Canvas for maze
-        canvas = tk.Canvas(frame, width=self.size*cell_size, height=self.size*cell_size)
+        canvas = tk.Canvas(frame, width=self.cols*cell_size, height=self.rows*cell_size)
         canvas.pack()
         
         self.maze_canvas = canvas
+        self._reset_view()
+        if wants_raster(self.rows * self.cols, raster):
+            self._raster = GridRaster(self.rows, self.cols, cell_size)
+            self._raster.attach(canvas)
+        else:
+            # The cell items are shared by every layer and recolored on a switch
+            for i in range(self.rows):
+                for j in range(self.cols):
+                    self._cell_items[i, j] = canvas.create_rectangle(
+                        j*cell_size, i*cell_size,
+                        (j+1)*cell_size, (i+1)*cell_size,
+                        outline="gray", tags="cell"
+                    )
         self.draw_current_layer()
         
         return frame
     
     def draw_current_layer(self):
-        cell_size = min(500 // self.size, 30)
-        self.maze_canvas.delete("all")
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                color = "black" if self.grid[self.current_layer][i][j] == 1 else "white"
-                self.maze_canvas.create_rectangle(
-                    j*cell_size, i*cell_size,
-                    (j+1)*cell_size, (i+1)*cell_size,
-                    fill=color, outline="gray"
-                )
-        
-        # Draw start and goal if in current layer
-        if self.start[0] == self.current_layer:
-            _, i, j = self.start
-            self.maze_canvas.create_rectangle(
-                j*cell_size, i*cell_size,
-                (j+1)*cell_size, (i+1)*cell_size,
-                fill="blue", outline="gray"
-            )
-        
-        if self.goal[0] == self.current_layer:
-            _, i, j = self.goal
-            self.maze_canvas.create_rectangle(
-                j*cell_size, i*cell_size,
-                (j+1)*cell_size, (i+1)*cell_size,
-                fill="red", outline="gray"
-            )
+        layer = self.current_layer
+        if self._raster is not None:
+            marks = {(i, j): self.shown_color((layer, i, j))
+                     for name, _ in OVERLAYS for z, i, j in self._overlays.get(name, ()) if z == layer}
+            for z, i, j in (self.start, self.goal):
+                if z == layer and (i, j) not in marks:
+                    marks[i, j] = self.cell_color((z, i, j))
+            self._raster.render(self.grid[layer], marks)
+        else:
+            for (i, j), item in self._cell_items.items():
+                self.maze_canvas.itemconfig(item, fill=self.shown_color((layer, i, j)))
         
         self.layer_label.config(text=f"Layer: {self.current_layer+1}/{self.depth}")
     
@@ -183,23 +399,23 @@ class RectangularMaze3D(RectangularMaze2D):
             self.current_layer += 1
             self.draw_current_layer()
     
-    def animate_path(self, canvas, path):
-        # For 3D maze, we need to handle layer changes during animation
-        cell_size = min(500 // self.size, 30)
-        
-        for step, (z, i, j) in enumerate(path):
-            def draw_step(z=z, i=i, j=j):
-                if z != self.current_layer:
-                    self.current_layer = z
-                    self.draw_current_layer()
-                
-                canvas.create_rectangle(
-                    j*cell_size, i*cell_size,
-                    (j+1)*cell_size, (i+1)*cell_size,
-                    fill="lightgreen", outline="gray"
-                )
-            
-            canvas.after(50 * step, draw_step)
+    def draw_path_cells(self, canvas, cells):
+        # A frame switches layer at most once, to the layer its batch ends on
+        layer = cells[-1][0]
+        if layer != self.current_layer:
+            self.current_layer = layer
+            self.draw_current_layer()
+        super().draw_path_cells(canvas, cells)
+    
+    def paint_cell(self, canvas, cell, color):
+        # Cells on other layers show up when their layer is drawn
+        z, i, j = cell
+        if z != self.current_layer:
+            return
+        if self._raster is not None:
+            self._raster.paint((i, j), color)
+        else:
+            self.maze_canvas.itemconfig(self._cell_items[i, j], fill=color)
     
     def get_neighbors(self, position):
         z, i, j = position
@@ -208,24 +424,32 @@ class RectangularMaze3D(RectangularMaze2D):
         
         for dz, di, dj in directions:
             nz, ni, nj = z + dz, i + di, j + dj
-            if (0 <= nz < self.depth and 0 <= ni < self.size and 0 <= nj < self.size and 
-                self.grid[nz][ni][nj] == 0):
+            if (0 <= nz < self.depth and 0 <= ni < self.rows and 0 <= nj < self.cols and 
+                self.grid.get((nz, ni, nj)) == 0):
                 neighbors.append((nz, ni, nj))
         
         return neighbors
+    
+    def get_adjacent(self, position):
+        z, i, j = position
+        directions = [(0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1), (-1, 0, 0), (1, 0, 0)]
+        return [(z + dz, i + di, j + dj) for dz, di, dj in directions
+                if 0 <= z + dz < self.depth and 0 <= i + di < self.rows and 0 <= j + dj < self.cols]
 
 class CircularMaze(Maze):
-    def __init__(self, size):
+    wrapping_axes = (1,)  # Sectors wrap around the circle
+    
+    def __init__(self, size, seed=None, generator=None, grid=None):
         self.size = size
         self.rings = min(size, 10)  # Number of concentric circles
         self.sectors = min(size * 2, 36)  # Number of sectors per ring
-        self.grid = self._generate_maze()
         self.start = (0, 0)  # Innermost ring, first sector
         self.goal = (self.rings-1, self.sectors//2)  # Outer ring, opposite side
+        self.grid = self._build_grid(seed, generator, grid)
     
-    def _generate_maze(self):
+    def _generate_maze(self, rng):
         # Generate a circular maze with radial walls
-        grid = [[0 if random.random() < 0.7 else 1 for _ in range(self.sectors)] 
+        grid = [[0 if rng.random() < 0.7 else 1 for _ in range(self.sectors)] 
                 for _ in range(self.rings)]
         
         # Ensure start and goal are open
@@ -239,12 +463,26 @@ class CircularMaze(Maze):
     def get_goal_position(self):
         return self.goal
     
-    def get_visualization(self, parent):
+    def get_dimensions(self):
+        return (self.rings, self.sectors)
+    
+    def get_heuristic(self):
+        # Manhattan distance overestimates across the sector seam
+        return PolarDistance()
+    
+    def get_visualization(self, parent, raster=None):
         canvas = tk.Canvas(parent, width=500, height=500)
         
         center_x, center_y = 250, 250
         max_radius = 200
         
+        self._reset_view()
+        if wants_raster(self.rings * self.sectors, raster):
+            self._raster = PolarRaster(self.rings, self.sectors, max_radius)
+            self._raster.render(self.grid, {self.start: "blue", self.goal: "red"})
+            self._raster.attach(canvas, center_x - max_radius, center_y - max_radius)
+            return canvas
+        
         # Draw rings
         for ring in range(self.rings):
             radius = (ring + 1) * (max_radius / self.rings)
@@ -286,8 +524,8 @@ class CircularMaze(Maze):
                         canvas.create_line(x1, y1, x2, y2, fill="red", width=2)
         
         # Draw start and goal
-        self.draw_position(canvas, center_x, center_y, max_radius, self.start, "blue")
-        self.draw_position(canvas, center_x, center_y, max_radius, self.goal, "red")
+        self.paint_cell(canvas, self.start, "blue")
+        self.paint_cell(canvas, self.goal, "red")
         
         return canvas
     
@@ -302,21 +540,23 @@ class CircularMaze(Maze):
         y = center_y - mid_r * math.cos(angle)
         radius = max_radius / (self.rings * 3)
         
-        canvas.create_oval(
+        return canvas.create_oval(
             x - radius, y - radius,
             x + radius, y + radius,
-            fill=color, outline="black"
+            fill=color, outline="black", tags="marker"
         )
     
-    def animate_path(self, canvas, path):
-        center_x, center_y = 250, 250
-        max_radius = 200
-        
-        for step, (ring, sector) in enumerate(path):
-            def draw_step(ring=ring, sector=sector):
-                self.draw_position(canvas, center_x, center_y, max_radius, (ring, sector), "lightgreen")
-            
-            canvas.after(50 * step, draw_step)
+    def paint_cell(self, canvas, cell, color):
+        if self._raster is not None:
+            self._raster.paint(cell, color)
+            return
+        # Walls are drawn as lines, so only start, goal and overlay cells
+        # carry a marker item; a cell losing its overlay loses the marker
+        item = self._cell_items.pop(cell, None)
+        if item is not None:
+            canvas.delete(item)
+        if color != self.cell_color(cell) or cell in (self.start, self.goal):
+            self._cell_items[cell] = self.draw_position(canvas, 250, 250, 200, cell, color)
     
     def get_neighbors(self, position):
         ring, sector = position
@@ -335,17 +575,28 @@ class CircularMaze(Maze):
             neighbors.append((ring, (sector+1) % self.sectors))
         
         return neighbors
+    
+    def get_adjacent(self, position):
+        ring, sector = position
+        adjacent = []
+        if ring > 0:
+            adjacent.append((ring-1, sector))
+        if ring < self.rings-1:
+            adjacent.append((ring+1, sector))
+        adjacent.append((ring, (sector-1) % self.sectors))
+        adjacent.append((ring, (sector+1) % self.sectors))
+        return adjacent
 
 class HexagonalMaze(Maze):
-    def __init__(self, size):
+    def __init__(self, size, seed=None, generator=None, grid=None):
         self.size = size
-        self.grid = self._generate_maze()
         self.start = (0, 0)
         self.goal = (size-1, size-1)
+        self.grid = self._build_grid(seed, generator, grid)
     
-    def _generate_maze(self):
+    def _generate_maze(self, rng):
         # Generate a hexagonal grid maze
-        grid = [[0 if random.random() < 0.7 else 1 for _ in range(self.size)] 
+        grid = [[0 if rng.random() < 0.7 else 1 for _ in range(self.size)] 
                 for _ in range(self.size)]
         
         # Ensure start and goal are open
@@ -359,31 +610,29 @@ class HexagonalMaze(Maze):
     def get_goal_position(self):
         return self.goal
     
-    def get_visualization(self, parent):
-        cell_size = min(500 // self.size, 30)
+    def get_dimensions(self):
+        return (self.size, self.size)
+    
+    def get_heuristic(self):
+        # Diagonal moves make Manhattan distance inadmissible here
+        return HexDistance()
+    
+    def get_visualization(self, parent, raster=None):
+        cell_size = max(1, min(500 // self.size, 30))
         canvas = tk.Canvas(parent, width=self.size*cell_size*1.5, height=self.size*cell_size)
         
+        self._reset_view()
+        if wants_raster(self.size * self.size, raster):
+            self._raster = HexRaster(self.size, self.size, cell_size)
+            self._raster.render(self.grid, {self.start: "blue", self.goal: "red"})
+            self._raster.attach(canvas)
+            return canvas
+        
+        # One hexagon item per cell, kept so later changes are a fill recolor
         for i in range(self.size):
             for j in range(self.size):
-                x = j * cell_size * 1.5
-                y = i * cell_size + (j % 2) * cell_size * 0.5
-                
-                # Draw hexagon
-                points = [
-                    x + cell_size * 0.5, y,
-                    x + cell_size * 1.5, y,
-                    x + cell_size * 2.0, y + cell_size * 0.5,
-                    x + cell_size * 1.5, y + cell_size,
-                    x + cell_size * 0.5, y + cell_size,
-                    x, y + cell_size * 0.5
-                ]
-                
-                color = "black" if self.grid[i][j] == 1 else "white"
-                canvas.create_polygon(points, fill=color, outline="gray")
-        
-        # Draw start and goal
-        self.draw_hex_position(canvas, cell_size, self.start, "blue")
-        self.draw_hex_position(canvas, cell_size, self.goal, "red")
+                self._cell_items[i, j] = self.draw_hex_position(canvas, cell_size, (i, j),
+                                                                self.cell_color((i, j)))
         
         return canvas
     
@@ -401,16 +650,13 @@ class HexagonalMaze(Maze):
             x, y + cell_size * 0.5
         ]
         
-        canvas.create_polygon(points, fill=color, outline="gray")
+        return canvas.create_polygon(points, fill=color, outline="gray", tags="cell")
     
-    def animate_path(self, canvas, path):
-        cell_size = min(500 // self.size, 30)
-        
-        for step, (i, j) in enumerate(path):
-            def draw_step(i=i, j=j):
-                self.draw_hex_position(canvas, cell_size, (i, j), "lightgreen")
-            
-            canvas.after(50 * step, draw_step)
+    def paint_cell(self, canvas, cell, color):
+        if self._raster is not None:
+            self._raster.paint(cell, color)
+        else:
+            canvas.itemconfig(self._cell_items[cell], fill=color)
     
     def get_neighbors(self, position):
         i, j = position
@@ -434,16 +680,38 @@ class HexagonalMaze(Maze):
                 neighbors.append((ni, nj))
         
         return neighbors
+    
+    def get_adjacent(self, position):
+        i, j = position
+        offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        if j % 2 == 0:
+            offsets.extend([(-1, -1), (-1, 1)])
+        else:
+            offsets.extend([(1, -1), (1, 1)])
+        return [(i + di, j + dj) for di, dj in offsets
+                if 0 <= i + di < self.size and 0 <= j + dj < self.size]
 
 class MazeFactory:
-    def create_maze(self, maze_type, size):
+    def create_maze(self, maze_type, size, flat=False, seed=None, generator=None, grid=None, shape=None, packed=False):
+        # generator is None for the classic 70%-open noise, or one of
+        # maze_generators.GENERATORS for a perfect maze; grid supplies the cells
+        # of an existing maze instead, see maze_io.load_maze. shape sets the
+        # (depth, rows, cols) of a 3D maze. packed stores the cells one bit each.
+        if flat and maze_type not in ("2D", "3D"):
+            raise ValueError(f"Flat backend is only available for rectangular mazes, not {maze_type}")
+        if packed and maze_type not in ("2D", "3D"):
+            raise ValueError(f"Packed storage is only available for rectangular mazes, not {maze_type}")
+        if shape is not None and maze_type != "3D":
+            raise ValueError(f"Custom dimensions are only available for 3D mazes, not {maze_type}")
+        
         if maze_type == "2D":
-            return RectangularMaze2D(size)
+            return RectangularMaze2D(size, flat=flat, seed=seed, generator=generator, grid=grid, packed=packed)
         elif maze_type == "3D":
-            return RectangularMaze3D(size)
+            return RectangularMaze3D(size, flat=flat, seed=seed, generator=generator, grid=grid, shape=shape,
+                                     packed=packed)
         elif maze_type == "Circular":
-            return CircularMaze(size)
+            return CircularMaze(size, seed=seed, generator=generator, grid=grid)
         elif maze_type == "Hexagonal":
-            return HexagonalMaze(size)
+            return HexagonalMaze(size, seed=seed, generator=generator, grid=grid)
         else:
             raise ValueError(f"Unknown maze type: {maze_type}")
\ No newline at end of file
@@ -0,0 +1,169 @@
+import math
+import tkinter as tk
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+# Mazes with more cells than this (50x50) are drawn as a single image
+# instead of one canvas item per cell
+RASTER_THRESHOLD = 2500
+OPEN_COLOR = "#ffffff"
+WALL_COLOR = "#000000"
+GRID_COLOR = "#bebebe"
+BACKGROUND = "#d9d9d9"
+
+
+def wants_raster(num_cells, raster=None):
+    # raster=None picks the renderer by maze size
+    return num_cells > RASTER_THRESHOLD if raster is None else raster
+
+
+class MazeRaster(ABC):
+    # A whole maze view as one tk.PhotoImage, so the canvas holds a single
+    # item however many cells there are. Cells map to pixel spans (y, x0, x1);
+    # a redraw composes the pixel rows in Python and puts them row by row.
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.image = tk.PhotoImage(width=width, height=height)
+
+    def attach(self, canvas, x=0, y=0):
+        return canvas.create_image(x, y, image=self.image, anchor="nw")
+
+    @abstractmethod
+    def cells(self):
+        # (cell, spans) for every cell of the maze
+        pass
+
+    @abstractmethod
+    def spans(self, cell):
+        pass
+
+    def render(self, grid, marks=None):
+        # grid holds 0/1 per cell; marks maps cells to colors drawn on top
+        marks = marks or {}
+        pixels = [[BACKGROUND] * self.width for _ in range(self.height)]
+        for cell, spans in self.cells():
+            color = marks.get(cell)
+            if color is None:
+                color = WALL_COLOR if grid[cell[0]][cell[1]] == 1 else OPEN_COLOR
+            for y, x0, x1 in spans:
+                pixels[y][x0:x1] = [color] * (x1 - x0)
+        for y, row in enumerate(pixels):
+            self.image.put("{" + " ".join(row) + "}", to=(0, y))
+
+    def paint(self, cell, color):
+        for y, x0, x1 in self.spans(cell):
+            self.image.put(color, to=(x0, y, x1, y + 1))
+
+
+class GridRaster(MazeRaster):
+    # Square cells; each maze row becomes one put of cell_size pixel rows,
+    # with a one-pixel grid line once cells are big enough to show it
+    def __init__(self, rows, cols, cell_size):
+        super().__init__(cols * cell_size, rows * cell_size)
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.line = 1 if cell_size >= 4 else 0
+
+    def spans(self, cell):
+        i, j = cell
+        size, line = self.cell_size, self.line
+        return [(y, j * size, (j + 1) * size - line) for y in range(i * size, (i + 1) * size - line)]
+
+    def cells(self):
+        for i in range(self.rows):
+            for j in range(self.cols):
+                yield (i, j), self.spans((i, j))
+
+    def render(self, grid, marks=None):
+        marks = marks or {}
+        size, line = self.cell_size, self.line
+        for i, row in enumerate(grid):
+            colors = [WALL_COLOR if value == 1 else OPEN_COLOR for value in row]
+            for (mi, mj), color in marks.items():
+                if mi == i:
+                    colors[mj] = color
+            pixels = []
+            for color in colors:
+                pixels.extend([color] * (size - line))
+                pixels.extend([GRID_COLOR] * line)
+            rows = ["{" + " ".join(pixels) + "}"] * (size - line)
+            rows.extend(["{" + " ".join([GRID_COLOR] * self.width) + "}"] * line)
+            self.image.put(" ".join(rows), to=(0, i * size))
+
+    def paint(self, cell, color):
+        i, j = cell
+        size, line = self.cell_size, self.line
+        self.image.put(color,
+                       to=(j * size, i * size, (j + 1) * size - line, (i + 1) * size - line))
+
+
+@lru_cache(maxsize=16)
+def hexagon_spans(cell_size):
+    # Scanlines of the flat-topped hexagon drawn by HexagonalMaze, relative
+    # to its bounding box: rows of height cell_size, two cells wide
+    spans = []
+    for dy in range(cell_size):
+        inset = abs(dy + 0.5 - cell_size / 2)
+        spans.append((dy, round(inset), round(2 * cell_size - inset)))
+    return tuple(spans)
+
+
+class HexRaster(MazeRaster):
+    def __init__(self, rows, cols, cell_size):
+        super().__init__(int(cols * cell_size * 1.5 + cell_size * 0.5) + 1,
+                         rows * cell_size + cell_size // 2 + 1)
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.shape = hexagon_spans(cell_size)
+
+    def spans(self, cell):
+        i, j = cell
+        x = int(j * self.cell_size * 1.5)
+        y = i * self.cell_size + (j % 2) * (self.cell_size // 2)
+        return [(y + dy, x + x0, x + x1) for dy, x0, x1 in self.shape]
+
+    def cells(self):
+        for i in range(self.rows):
+            for j in range(self.cols):
+                yield (i, j), self.spans((i, j))
+
+
+@lru_cache(maxsize=4)
+def polar_spans(rings, sectors, radius):
+    # Pixel spans of every (ring, sector) cell of a disc of the given radius,
+    # found once per geometry by classifying each pixel center
+    ring_width = radius / rings
+    sector_angle = 2 * math.pi / sectors
+    spans = {}
+    for y in range(2 * radius + 1):
+        dy = y + 0.5 - radius
+        run_start, run_cell = 0, None
+        for x in range(2 * radius + 2):
+            cell = None
+            if x <= 2 * radius:
+                dx = x + 0.5 - radius
+                ring = int(math.hypot(dx, dy) / ring_width)
+                if ring < rings:
+                    # Sector 0 starts straight up and runs clockwise
+                    sector = int(math.atan2(dx, -dy) % (2 * math.pi) / sector_angle) % sectors
+                    cell = (ring, sector)
+            if cell != run_cell:
+                if run_cell is not None:
+                    spans.setdefault(run_cell, []).append((y, run_start, x))
+                run_start, run_cell = x, cell
+    return spans
+
+
+class PolarRaster(MazeRaster):
+    def __init__(self, rings, sectors, radius):
+        super().__init__(2 * radius + 1, 2 * radius + 1)
+        self.geometry = polar_spans(rings, sectors, radius)
+
+    def spans(self, cell):
+        return self.geometry.get(tuple(cell), ())
+
+    def cells(self):
+        return self.geometry.items()
@@ -1,6 +1,7 @@
 import heapq
 from collections import deque
-import copy
+from itertools import count
+from utils.traffic_state import VehicleTable, METRICS
 
 # =========================
 # A* Algorithm
@@ -144,174 +145,184 @@ def reconstruct_path(came_from, current, start):
 # Traffic Puzzle Solver
 # =========================
 
-def solve_traffic_puzzle(initial_board, algorithm="A*"):
-    if algorithm == "BFS":
-        return bfs(initial_board)
+def solve_traffic_puzzle(initial_board, algorithm="A*", metric="moves", database=None):
+    # Searches run on VehicleTable int states; only the returned solution
+    # path is decoded back into boards for TrafficPuzzleBoard. metric is one
+    # of traffic_state.METRICS. For A*, when database (a
+    # traffic_db.TrafficDatabase) holds a table for the board's cluster, the
+    # same optimal cost is read from it instead of searching; a table that
+    # turns out inconsistent falls back to the search.
+    if metric not in METRICS:
+        raise ValueError(f"Unknown cost metric: {metric}")
+    table, state = VehicleTable.from_board(initial_board)
+    if table.red is None:
+        return None
+    distances = None
+    if database is not None and algorithm == "A*":
+        distances = database.find(table, state)
+    if distances is not None:
+        try:
+            path = distances.solve(state, metric)
+        except ValueError:
+            path = a_star_states(table, state, metric)
+    elif algorithm == "BFS":
+        path = bfs_states(table, state, metric)
     elif algorithm == "DFS":
-        return dfs(initial_board)
+        path = dfs_states(table, state)
     else:
-        return a_star(initial_board)
+        path = a_star_states(table, state, metric)
+    if path is None:
+        return None
+    return [table.decode(step) for step in path]
 
 # ================= A* Search ================= #
 def a_star(initial_board):
-    def heuristic(state):
-        # Heuristic: distance of red car (R) to exit
-        for r in range(6):
-            for c in range(6):
-                if state[r][c] == 'R':
-                    # Find the last R (assuming horizontal 2-long red car)
-                    return 5 - c
-        return float('inf')
-
-    def serialize(board):
-        return tuple(tuple(row) for row in board)
-
-    visited = set()
-    pq = []
-    heapq.heappush(pq, (0 + heuristic(initial_board), 0, initial_board, [copy.deepcopy(initial_board)]))
+    # Board in, boards out, one cell per step, as before states existed
+    def search(table, state):
+        path = a_star_states(table, state, "cells moved")
+        return None if path is None else unit_steps(table, path)
+
+    return search_board(initial_board, search)
+
+def a_star_states(table, initial_state, metric="moves"):
+    # Expands full slides, costing 1 each or the cells they cover, guided by
+    # the blocking-car bound, which each child derives from its parent's.
+    # States the bound proves dead are never queued. Heap entries carry a
+    # push counter to break ties, and the path is rebuilt from parent links.
+    per_cell = metric == "cells moved"
+    index = 1 if per_cell else 0
+    bounds = {initial_state: table.blocking_bound(initial_state)}
+    if bounds[initial_state] is None:
+        return None
+    tie_break = count()
+    g_score = {initial_state: 0}
+    parents = {initial_state: None}
+    pq = [(bounds[initial_state][index], 0, next(tie_break), initial_state)]
 
     while pq:
-        f, g, current, path = heapq.heappop(pq)
-        if is_goal(current):
-            return path
-        key = serialize(current)
-        if key in visited:
-            continue
-        visited.add(key)
-
-        for next_state in generate_moves(current):
-            next_path = path + [copy.deepcopy(next_state)]
-            h = heuristic(next_state)
-            heapq.heappush(pq, (g + 1 + h, g + 1, next_state, next_path))
+        f, g, _, current = heapq.heappop(pq)
+        if g > g_score[current]:
+            continue  # Superseded by a cheaper route
+        if table.is_goal(current):
+            return trace_states(parents, current)
+
+        bound = bounds[current]
+        for next_state, vehicle, cells in table.slides(current):
+            tentative_g = g + (cells if per_cell else 1)
+            if next_state in g_score and tentative_g >= g_score[next_state]:
+                continue
+            if next_state not in bounds:
+                bounds[next_state] = table.refresh_bound(bound, current, next_state, vehicle)
+            next_bound = bounds[next_state]
+            if next_bound is None:
+                continue
+            g_score[next_state] = tentative_g
+            parents[next_state] = current
+            heapq.heappush(pq, (tentative_g + next_bound[index], tentative_g, next(tie_break), next_state))
 
     return None
 
 # ================= BFS ================= #
 def bfs(initial_board):
-    visited = set()
-    queue = deque()
-    queue.append((initial_board, [copy.deepcopy(initial_board)]))
-    visited.add(serialize(initial_board))
+    return search_board(initial_board, lambda table, state: bfs_states(table, state, "cells moved"))
+
+def bfs_states(table, initial_state, metric="moves"):
+    # Unit-cost levels: whole slides, or single-cell steps when counting cells.
+    # The parent map doubles as the visited set.
+    if metric == "cells moved":
+        successors = table.successors
+    else:
+        successors = lambda state: (next_state for next_state, _, _ in table.slides(state))
+    parents = {initial_state: None}
+    queue = deque([initial_state])
 
     while queue:
-        current, path = queue.popleft()
-        if is_goal(current):
-            return path
+        current = queue.popleft()
+        if table.is_goal(current):
+            return trace_states(parents, current)
 
-        for next_state in generate_moves(current):
-            key = serialize(next_state)
-            if key not in visited:
-                visited.add(key)
-                queue.append((next_state, path + [copy.deepcopy(next_state)]))
+        for next_state in successors(current):
+            if next_state not in parents:
+                parents[next_state] = current
+                queue.append(next_state)
 
     return None
 
 # ================= DFS ================= #
 def dfs(initial_board, depth_limit=50):
+    return search_board(initial_board, lambda table, state: dfs_states(table, state, depth_limit, "cells moved"))
+
+def dfs_states(table, initial_state, depth_limit=50, metric="moves"):
+    # One shared path, extended and trimmed as the recursion goes; whole
+    # slides, or single-cell steps when counting cells
+    if metric == "cells moved":
+        successors = table.successors
+    else:
+        successors = lambda state: (next_state for next_state, _, _ in table.slides(state))
     visited = set()
+    path = [initial_state]
 
-    def dfs_recursive(state, path, depth):
-        if is_goal(state):
-            return path
+    def dfs_recursive(state, depth):
+        if table.is_goal(state):
+            return True
         if depth > depth_limit:
-            return None
+            return False
 
-        key = serialize(state)
-        if key in visited:
-            return None
-        visited.add(key)
+        if state in visited:
+            return False
+        visited.add(state)
 
-        for next_state in generate_moves(state):
-            result = dfs_recursive(next_state, path + [copy.deepcopy(next_state)], depth + 1)
-            if result:
-                return result
-        return None
+        for next_state in successors(state):
+            path.append(next_state)
+            if dfs_recursive(next_state, depth + 1):
+                return True
+            path.pop()
+        return False
+
+    return path if dfs_recursive(initial_state, 0) else None
+
+def trace_states(parents, state):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
 
-    return dfs_recursive(initial_board, [copy.deepcopy(initial_board)], 0)
+def unit_steps(table, path):
+    # Split every slide of a state path into its single-cell steps
+    steps = path[:1]
+    for state in path[1:]:
+        for shift in table.shifts:
+            delta = (state >> shift & table.field) - (steps[-1] >> shift & table.field)
+            if delta:
+                unit = 1 << shift if delta > 0 else -(1 << shift)
+                for _ in range(abs(delta)):
+                    steps.append(steps[-1] + unit)
+                break
+    return steps
 
 # ================= Helpers ================= #
+def search_board(initial_board, search):
+    # Run search(table, state) on a board and decode its path, None if unsolvable
+    table, state = VehicleTable.from_board(initial_board)
+    if table.red is None:
+        return None
+    path = search(table, state)
+    if path is None:
+        return None
+    return [table.decode(step) for step in path]
+
 def is_goal(board):
     # Goal: 'R' car reaches column 5
-    for c in range(5, -1, -1):
-        if board[2][c] == 'R':
-            return c + 1 == 6  # right edge
-    return False
-
-def serialize(board):
-    return tuple(tuple(row) for row in board)
+    table, state = VehicleTable.from_board(board)
+    return table.is_goal(state)
 
 def generate_moves(board):
-    # VERY simplified move generator: only attempts moving 1 step left/right or up/down for any car
-    moves = []
-    rows, cols = 6, 6
-    seen = set()
-
-    for r in range(rows):
-        for c in range(cols):
-            car = board[r][c]
-            if car == '.' or (r, c, car) in seen:
-                continue
-            seen.add((r, c, car))
-
-            orientation = get_orientation(board, r, c)
-            positions = get_car_positions(board, car)
-
-            if orientation == 'horizontal':
-                left_clear = min(col for _, col in positions) - 1
-                right_clear = max(col for _, col in positions) + 1
-
-                if 0 <= left_clear < cols and board[r][left_clear] == '.':
-                    new_board = copy.deepcopy(board)
-                    for _, col in reversed(positions):
-                        new_board[r][col] = '.'
-                    new_board[r][left_clear] = car
-                    for _, col in positions[:-1]:
-                        new_board[r][col + 1] = car
-                    moves.append(new_board)
-
-                if 0 <= right_clear < cols and board[r][right_clear] == '.':
-                    new_board = copy.deepcopy(board)
-                    for _, col in positions:
-                        new_board[r][col] = '.'
-                    new_board[r][right_clear] = car
-                    for _, col in positions[1:]:
-                        new_board[r][col - 1] = car
-                    moves.append(new_board)
-
-            elif orientation == 'vertical':
-                top_clear = min(row for row, _ in positions) - 1
-                bottom_clear = max(row for row, _ in positions) + 1
-
-                if 0 <= top_clear < rows and board[top_clear][c] == '.':
-                    new_board = copy.deepcopy(board)
-                    for row, _ in reversed(positions):
-                        new_board[row][c] = '.'
-                    new_board[top_clear][c] = car
-                    for row, _ in positions[:-1]:
-                        new_board[row + 1][c] = car
-                    moves.append(new_board)
-
-                if 0 <= bottom_clear < rows and board[bottom_clear][c] == '.':
-                    new_board = copy.deepcopy(board)
-                    for row, _ in positions:
-                        new_board[row][c] = '.'
-                    new_board[bottom_clear][c] = car
-                    for row, _ in positions[1:]:
-                        new_board[row - 1][c] = car
-                    moves.append(new_board)
-
-    return moves
-
-def get_car_positions(board, car):
-    return [(r, c) for r in range(6) for c in range(6) if board[r][c] == car]
-
-def get_orientation(board, r, c):
-    car = board[r][c]
-    if c + 1 < 6 and board[r][c + 1] == car:
-        return 'horizontal'
-    if r + 1 < 6 and board[r + 1][c] == car:
-        return 'vertical'
-    return 'horizontal'  # Default fallback
+    # Boards one single-cell slide away; the searches use table.successors
+    # and table.slides directly
+    table, state = VehicleTable.from_board(board)
+    return [table.decode(next_state) for next_state in table.successors(state)]
 
 
 # n queens problem solver
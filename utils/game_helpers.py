@@ -1,13 +1,85 @@
 import random
 import math
-from utils.ai_algorithms import a_star_search
+import time
+from array import array
+from bitboard import Bitboard
+from raster import GridRaster, wants_raster
+from animation import PathAnimation
+
+def generate_random_maze(grid_size, wall_probability=0.5, max_attempts=20, stats=None):
+    # Draws of i.i.d. walls are kept only if the corners connect, which is
+    # exact but rarely succeeds on big grids near the percolation threshold;
+    # after max_attempts a maze is built around a guaranteed path instead.
+    # stats, if given, receives attempts, constructed and seconds.
+    started = time.perf_counter()
+    maze = None
+    attempts = 0
+    while maze is None and attempts < max_attempts:
+        attempts += 1
+        maze = draw_connected_maze(grid_size, wall_probability)
+    
+    constructed = maze is None
+    if constructed:
+        maze = construct_connected_maze(grid_size, wall_probability)
+    if stats is not None:
+        stats.update(attempts=attempts, constructed=constructed, seconds=time.perf_counter() - started)
+    return maze
+
+def draw_connected_maze(grid_size, wall_probability=0.5):
+    # Fill row by row, joining open cells with union-find as they are drawn.
+    # Paths between rows must cross every row in between, so the draw is
+    # abandoned (None) once a finished row holds nothing of the start's cluster.
+    parent = array('i', range(grid_size * grid_size))
+    
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    
+    maze = []
+    for i in range(grid_size):
+        row = [1 if random.random() < wall_probability else 0 for _ in range(grid_size)]
+        if i == 0:
+            row[0] = 0
+        if i == grid_size - 1:
+            row[-1] = 0
+        
+        base = i * grid_size
+        above = maze[i - 1] if i else None
+        for j in range(grid_size):
+            if row[j]:
+                continue
+            node = base + j
+            if j and not row[j - 1]:
+                parent[find(node)] = find(node - 1)
+            if above is not None and not above[j]:
+                parent[find(node)] = find(node - grid_size)
+        maze.append(row)
+        
+        start = find(0)
+        if not any(not row[j] and find(base + j) == start for j in range(grid_size)):
+            return None
+    
+    if find(grid_size * grid_size - 1) != find(0):
+        return None
+    return maze
 
-def generate_random_maze(grid_size):
-    while True:
-        maze = [[1 if random.random() < 0.5 else 0 for _ in range(grid_size)] for _ in range(grid_size)]
-        maze[0][0], maze[grid_size - 1][grid_size - 1] = 0, 0
-        if is_path_possible(maze):
-            return maze
+def construct_connected_maze(grid_size, wall_probability=0.5):
+    # Keep a random monotone staircase from corner to corner open and give the
+    # other cells proportionally more walls, so the expected density matches
+    moves = [(1, 0)] * (grid_size - 1) + [(0, 1)] * (grid_size - 1)
+    random.shuffle(moves)
+    i = j = 0
+    path = {(0, 0)}
+    for di, dj in moves:
+        i, j = i + di, j + dj
+        path.add((i, j))
+    
+    cells = grid_size * grid_size
+    adjusted = min(1.0, wall_probability * cells / (cells - len(path))) if cells > len(path) else 0.0
+    return [[0 if (i, j) in path else (1 if random.random() < adjusted else 0)
+             for j in range(grid_size)] for i in range(grid_size)]
 
 def generate_spiral_maze(grid_size):
     maze = [[1 for _ in range(grid_size)] for _ in range(grid_size)]
@@ -79,10 +151,17 @@ def generate_maze_grid(size, maze_type="rectangular"):
         raise ValueError(f"Unknown maze type: {maze_type}")
 
 def is_path_possible(maze):
-    return a_star_search(maze, (0, 0), (len(maze)-1, len(maze)-1)) is not None
+    goal = (len(maze)-1, len(maze)-1)
+    return Bitboard.from_grid(maze).is_reachable((0, 0), goal)
 
-def draw_maze(canvas, grid, cell_size, start=None, goal=None):
+def draw_maze(canvas, grid, cell_size, start=None, goal=None, raster=None):
     canvas.delete("all")
+    if wants_raster(len(grid) * len(grid[0]), raster):
+        image = GridRaster(len(grid), len(grid[0]), cell_size)
+        image.render(grid, {tuple(cell): color for cell, color in ((start, "blue"), (goal, "red")) if cell})
+        image.attach(canvas)
+        canvas.maze_raster = image  # The canvas item does not keep the PhotoImage alive
+        return
     for i, row in enumerate(grid):
         for j, val in enumerate(row):
             color = "black" if val == 1 else "white"
@@ -110,17 +189,19 @@ def draw_maze(canvas, grid, cell_size, start=None, goal=None):
         )
 
 def animate_path(canvas, path, cell_size, delay=100):
-    for i, (x, y) in enumerate(path):
-        canvas.after(i * delay, lambda x=x, y=y: canvas.create_rectangle(
-            y * cell_size, x * cell_size,
-            (y + 1) * cell_size, (x + 1) * cell_size,
-            fill="lightgreen"
-        ))
+    # One step every delay ms on a single timer; returns the PathAnimation
+    def draw_steps(cells):
+        for x, y in cells:
+            canvas.create_rectangle(
+                y * cell_size, x * cell_size,
+                (y + 1) * cell_size, (x + 1) * cell_size,
+                fill="lightgreen"
+            )
+    return PathAnimation(canvas, path, draw_steps, speed=1000 / delay).start()
 
 CELL_SIZE = 100
 
 import tkinter as tk
-import time
 
 CELL_SIZE = 100
 ANIMATION_DELAY = 0.3  # seconds between steps
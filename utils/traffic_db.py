@@ -0,0 +1,251 @@
+import argparse
+import glob
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+from utils.traffic_state import VehicleTable, METRICS
+
+# File layout, little-endian:
+#   header    magic, version, rows, cols, vehicle count, exit row, bits per
+#             vehicle offset, state count
+#   vehicles  id, horizontal, line, length per vehicle, in table order
+#   states    at STATES_ALIGN: every state of the cluster, sorted, as u64
+#   distances one byte per state for each of METRICS in turn, NO_GOAL
+#             where the red car can never get out
+MAGIC = b'TRAF'
+VERSION = 2
+STATES_ALIGN = 8
+HEADER = struct.Struct('<4sHBBBBBxI')
+VEHICLE = struct.Struct('<cBBB')
+NO_GOAL = 255
+SUFFIX = '.tdb'
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "traffic_puzzle")
+
+
+class DistanceTable:
+    # Moves and cells left to the nearest goal for every state reachable
+    # from one traffic puzzle board. Slides can always be undone, so the
+    # states reachable from a board form a closed cluster: it is enumerated
+    # once, then a breadth-first pass outwards from all its goal states
+    # labels each state, and any board in the cluster is solved by stepping
+    # to a neighbour one cost unit closer, without searching.
+    def __init__(self, table, states, distances):
+        self.table = table
+        self.states = states  # sorted sequence of u64 states
+        self.distances = distances  # {metric: bytes aligned with states}
+
+    @classmethod
+    def build(cls, table, state):
+        if table.red is None:
+            raise ValueError("The board has no red car on the exit row")
+        if table.bits * len(table.vehicles) > 64:
+            raise ValueError("Too many vehicles to store states in 64 bits")
+        seen = {state}
+        queue = deque([state])
+        while queue:
+            current = queue.popleft()
+            for next_state, _, _ in table.slides(current):
+                if next_state not in seen:
+                    seen.add(next_state)
+                    queue.append(next_state)
+        states = sorted(seen)
+        index = {state: k for k, state in enumerate(states)}
+        goals = [k for k, state in enumerate(states) if table.is_goal(state)]
+
+        distances = {}
+        for metric in METRICS:
+            # Moves step by slides; cells moved by single-cell slides
+            if metric == "moves":
+                neighbors = lambda state: (next_state for next_state, _, _ in table.slides(state))
+            else:
+                neighbors = table.successors
+            labels = bytearray([NO_GOAL]) * len(states)
+            for k in goals:
+                labels[k] = 0
+            queue = deque(goals)
+            while queue:
+                k = queue.popleft()
+                distance = labels[k] + 1
+                if distance == NO_GOAL:
+                    raise ValueError(f"Solutions longer than {NO_GOAL - 1} {metric} cannot be stored")
+                for next_state in neighbors(states[k]):
+                    j = index[next_state]
+                    if labels[j] == NO_GOAL:
+                        labels[j] = distance
+                        queue.append(j)
+            distances[metric] = bytes(labels)
+        return cls(table, array('Q', states), distances)
+
+    def __len__(self):
+        return len(self.states)
+
+    def _index(self, state):
+        k = bisect_left(self.states, state)
+        if k < len(self.states) and self.states[k] == state:
+            return k
+        return None
+
+    def __contains__(self, state):
+        return self._index(state) is not None
+
+    def distance(self, state, metric="moves"):
+        # Cost of an optimal solution, or None when there is none
+        k = self._index(state)
+        if k is None:
+            raise KeyError(f"State {state:#x} is not in this table")
+        distance = self.distances[metric][k]
+        return None if distance == NO_GOAL else distance
+
+    def solve(self, state, metric="moves"):
+        # Optimal path of states to a goal, one slide per step, or None
+        remaining = self.distance(state, metric)
+        if remaining is None:
+            return None
+        labels = self.distances[metric]
+        per_cell = metric == "cells moved"
+        path = [state]
+        while remaining:
+            for next_state, _, cells in self.table.slides(state):
+                cost = cells if per_cell else 1
+                k = self._index(next_state)
+                if cost <= remaining and k is not None and labels[k] == remaining - cost:
+                    break
+            else:
+                raise ValueError("distance table is inconsistent with its layout")
+            state = next_state
+            remaining -= cost
+            path.append(state)
+        return path
+
+
+def layout_key(table):
+    # Names the layout, i.e. the board minus where each vehicle sits, along
+    # with how states encode it, so files from another encoding never match
+    layout = repr((table.rows, table.cols, table.vehicles, table.exit_row, table.shifts)).encode('ascii')
+    return hashlib.sha1(layout).hexdigest()[:16]
+
+
+def save_table(distances, path):
+    table = distances.table
+    header = HEADER.pack(MAGIC, VERSION, table.rows, table.cols, len(table.vehicles),
+                         table.exit_row, table.bits, len(distances))
+    for vehicle_id, horizontal, line, length in table.vehicles:
+        header += VEHICLE.pack(vehicle_id.encode('ascii'), horizontal, line, length)
+    header += bytes(-len(header) % STATES_ALIGN)
+
+    states = array('Q', distances.states)
+    if sys.byteorder == 'big':
+        states.byteswap()
+    with open(path, 'wb') as stream:
+        stream.write(header)
+        stream.write(states.tobytes())
+        for metric in METRICS:
+            stream.write(distances.distances[metric])
+
+
+def load_table(path):
+    # The file is mapped read-only; lookups touch only the pages they bisect through
+    with open(path, 'rb') as stream:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, rows, cols, count, exit_row, bits, size = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a traffic puzzle table")
+    if version != VERSION:
+        raise ValueError(f"Unsupported traffic puzzle table version {version}")
+    vehicles = []
+    for k in range(count):
+        vehicle_id, horizontal, line, length = VEHICLE.unpack_from(mapped, HEADER.size + k * VEHICLE.size)
+        vehicles.append((vehicle_id.decode('ascii'), bool(horizontal), line, length))
+    table = VehicleTable(rows, cols, vehicles, exit_row)
+    if table.bits != bits:
+        raise ValueError(f"{path} was written for a different state encoding")
+    offset = HEADER.size + count * VEHICLE.size
+    offset += -offset % STATES_ALIGN
+    if len(mapped) < offset + size * (8 + len(METRICS)):
+        raise ValueError(f"{path} is truncated")
+
+    view = memoryview(mapped)
+    states = view[offset:offset + 8 * size]
+    if sys.byteorder == 'big':
+        states = array('Q', states.tobytes())
+        states.byteswap()
+    else:
+        states = states.cast('Q')
+    offset += 8 * size
+    distances = {}
+    for metric in METRICS:
+        distances[metric] = view[offset:offset + size]
+        offset += size
+    return DistanceTable(table, states, distances)
+
+
+class TrafficDatabase:
+    # Directory of DistanceTable files, one per cluster, named by layout key
+    # and the cluster's smallest state. Tables are loaded on first lookup of
+    # their layout and kept for later solves; files that fail to load, e.g.
+    # from an older version, are passed over and rebuilt by precompute.
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        self.tables = {}  # path -> DistanceTable
+
+    def _candidates(self, table):
+        for path in sorted(glob.glob(os.path.join(self.directory, layout_key(table) + '-*' + SUFFIX))):
+            if path not in self.tables:
+                try:
+                    self.tables[path] = load_table(path)
+                except ValueError:
+                    continue
+            if self.tables[path].table.vehicles == table.vehicles:
+                yield self.tables[path]
+
+    def find(self, table, state):
+        # The stored table whose cluster holds state, or None
+        for distances in self._candidates(table):
+            if state in distances:
+                return distances
+        return None
+
+    def precompute(self, board):
+        # Build and store the table for board's cluster unless it already exists
+        table, state = VehicleTable.from_board(board)
+        distances = self.find(table, state)
+        if distances is not None:
+            return distances
+        distances = DistanceTable.build(table, state)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{layout_key(table)}-{distances.states[0]:x}{SUFFIX}")
+        save_table(distances, path)
+        self.tables[path] = distances
+        return distances
+
+
+def main(argv=None):
+    from games.traffic_puzzle import get_initial_board
+
+    difficulties = ["easy", "medium", "hard"]
+    parser = argparse.ArgumentParser(description="Precompute traffic puzzle distance tables")
+    parser.add_argument("--difficulties", nargs="+", default=difficulties, choices=difficulties)
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY)
+    args = parser.parse_args(argv)
+
+    database = TrafficDatabase(args.directory)
+    for difficulty in args.difficulties:
+        board = get_initial_board(difficulty)
+        distances = database.precompute(board)
+        _, state = VehicleTable.from_board(board)
+        moves = distances.distance(state)
+        if moves is None:
+            print(f"{difficulty}: {len(distances)} states, no solution")
+        else:
+            print(f"{difficulty}: {len(distances)} states, {moves} moves, "
+                  f"{distances.distance(state, 'cells moved')} cells moved")
+
+
+if __name__ == "__main__":
+    main()
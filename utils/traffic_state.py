@@ -0,0 +1,220 @@
+EMPTY = '.'
+RED = 'R'
+EXIT_ROW = 2  # The exit is at the right end of this row
+# Solution cost: one per slide of any distance, or one per cell travelled
+METRICS = ("moves", "cells moved")
+
+
+class VehicleTable:
+    # Static facts about a traffic puzzle layout, extracted once from its
+    # board: per vehicle its id, orientation, fixed row (horizontal) or
+    # column (vertical) and length. A state is then a single int packing
+    # every vehicle's offset along its lane into a fixed-width bit field,
+    # and occupancy is a bitmask with cell (r, c) at bit r * cols + c.
+    def __init__(self, rows, cols, vehicles, exit_row=EXIT_ROW):
+        self.rows = rows
+        self.cols = cols
+        self.vehicles = vehicles  # [(id, horizontal, line, length)]
+        self.exit_row = exit_row
+        self.bits = max(rows, cols).bit_length()
+        self.field = (1 << self.bits) - 1
+        self.shifts = [k * self.bits for k in range(len(vehicles))]
+
+        # lanes[k] lists the cell bits along vehicle k's row or column;
+        # masks[k][offset] is the vehicle's own occupancy at that offset
+        self.lanes = []
+        self.masks = []
+        for _, horizontal, line, length in vehicles:
+            if horizontal:
+                lane = [1 << (line * cols + c) for c in range(cols)]
+            else:
+                lane = [1 << (r * cols + line) for r in range(rows)]
+            self.lanes.append(lane)
+            self.masks.append([sum(lane[offset:offset + length]) for offset in range(len(lane) - length + 1)])
+
+        # The red car's index, or None when there is none or it can never
+        # leave: only a horizontal red car on the exit row can, and a board
+        # without one is unsolvable
+        ids = [vehicle[0] for vehicle in vehicles]
+        self.red = ids.index(RED) if RED in ids else None
+        if self.red is not None:
+            _, horizontal, line, length = vehicles[self.red]
+            if not horizontal or line != exit_row:
+                self.red = None
+            else:
+                self.goal_offset = cols - length  # Touching the right edge
+
+    @classmethod
+    def from_board(cls, board):
+        # (table, state) for a board of vehicle letters and '.' for empty cells
+        rows, cols = len(board), len(board[0])
+        cells = {}
+        for r, row in enumerate(board):
+            for c, value in enumerate(row):
+                if value != EMPTY:
+                    cells.setdefault(value, []).append((r, c))
+
+        # Vehicles in id order, so every board of one layout shares a state encoding
+        vehicles = []
+        offsets = []
+        for vehicle_id, positions in sorted(cells.items()):
+            # A one-cell vehicle counts as horizontal
+            rows_used = {r for r, _ in positions}
+            horizontal = len(rows_used) == 1
+            if horizontal:
+                line, coords = positions[0][0], sorted(c for _, c in positions)
+            elif len({c for _, c in positions}) == 1:
+                line, coords = positions[0][1], sorted(r for r, _ in positions)
+            else:
+                raise ValueError(f"Vehicle {vehicle_id} is not in a single row or column")
+            if coords[-1] - coords[0] + 1 != len(coords):
+                raise ValueError(f"Vehicle {vehicle_id} has a gap")
+            vehicles.append((vehicle_id, horizontal, line, len(coords)))
+            offsets.append(coords[0])
+
+        table = cls(rows, cols, vehicles)
+        return table, table.encode(offsets)
+
+    def encode(self, offsets):
+        state = 0
+        for offset, shift in zip(offsets, self.shifts):
+            state |= offset << shift
+        return state
+
+    def offsets(self, state):
+        field = self.field
+        return [state >> shift & field for shift in self.shifts]
+
+    def occupancy(self, state):
+        occupied = 0
+        field = self.field
+        for masks, shift in zip(self.masks, self.shifts):
+            occupied |= masks[state >> shift & field]
+        return occupied
+
+    def is_goal(self, state):
+        return self.red is not None and state >> self.shifts[self.red] & self.field == self.goal_offset
+
+    def red_distance(self, state):
+        # Cells the red car still has to travel
+        return self.goal_offset - (state >> self.shifts[self.red] & self.field)
+
+    def successors(self, state):
+        # States one single-cell slide away
+        occupied = self.occupancy(state)
+        field = self.field
+        for k, lane in enumerate(self.lanes):
+            shift = self.shifts[k]
+            offset = state >> shift & field
+            length = self.vehicles[k][3]
+            if offset > 0 and not occupied & lane[offset - 1]:
+                yield state - (1 << shift)
+            if offset + length < len(lane) and not occupied & lane[offset + length]:
+                yield state + (1 << shift)
+
+    def slides(self, state):
+        # (state, vehicle, cells moved) for every legal slide of every
+        # vehicle, of any distance, walking each lane outwards until blocked
+        occupied = self.occupancy(state)
+        field = self.field
+        for k, lane in enumerate(self.lanes):
+            shift = self.shifts[k]
+            offset = state >> shift & field
+            length = self.vehicles[k][3]
+            step = offset - 1
+            while step >= 0 and not occupied & lane[step]:
+                yield state - ((offset - step) << shift), k, offset - step
+                step -= 1
+            step = offset + length
+            while step < len(lane) and not occupied & lane[step]:
+                distance = step - offset - length + 1
+                yield state + (distance << shift), k, distance
+                step += 1
+
+    def blocking_bound(self, state):
+        # Admissible lower bounds on the rest of the solution, or None when
+        # the red car can never reach the exit. Every vehicle standing on the
+        # red car's path must move; so must every vehicle that sits in the
+        # lane cells a blocker would cross in each of its feasible directions
+        # out of the way, and so on down the chain. The result is (moves,
+        # cells moved, cells read, vehicles read as a bitmask); the last two
+        # let refresh_bound reuse the bound for children that leave them alone.
+        offsets = self.offsets(state)
+        occupants = [self.masks[k][offset] for k, offset in enumerate(offsets)]
+        occupied = 0
+        for mask in occupants:
+            occupied |= mask
+        red = self.red
+        lane = self.lanes[red]
+        path = sum(lane[offsets[red] + self.vehicles[red][3]:])
+        support, involved = path, 1 << red
+        moves, cells = 1, self.red_distance(state)
+        if cells == 0:
+            return 0, 0, support, involved
+
+        must = {red}
+        pending = [(k, path, True) for k, mask in enumerate(occupants) if k != red and mask & path]
+        while pending:
+            k, avoid, direct = pending.pop()
+            if k in must:
+                continue
+            must.add(k)
+            involved |= 1 << k
+            moves += 1
+            if not avoid:
+                cells += 1
+                continue
+            options = self._clearances(k, offsets[k], avoid)
+            if not options:
+                return None
+            # Only vehicles in the way of every option are sure to move
+            cells += min(distance for distance, _ in options) if direct else 1
+            common, shared = None, -1
+            for _, traversed in options:
+                support |= traversed
+                shared &= traversed
+                if traversed & occupied:
+                    found = {j for j, mask in enumerate(occupants) if mask & traversed}
+                else:
+                    found = set()
+                common = found if common is None else common & found
+            pending.extend((j, occupants[j] & shared, False) for j in common)
+        return moves, cells, support, involved
+
+    def _clearances(self, k, offset, avoid):
+        # (distance, lane cells crossed) of the shortest slide each way that
+        # takes vehicle k off every cell in avoid, ignoring other vehicles
+        lane, masks = self.lanes[k], self.masks[k]
+        length = self.vehicles[k][3]
+        options = []
+        for new in range(offset - 1, -1, -1):
+            if not masks[new] & avoid:
+                options.append((offset - new, sum(lane[new:offset])))
+                break
+        for new in range(offset + 1, len(masks)):
+            if not masks[new] & avoid:
+                options.append((new - offset, sum(lane[offset + length:new + length])))
+                break
+        return options
+
+    def refresh_bound(self, bound, parent, state, vehicle):
+        # The child's blocking_bound, reusing the parent's when the vehicle
+        # that slid was not part of it and crossed none of the cells it read
+        _, _, support, involved = bound
+        shift = self.shifts[vehicle]
+        masks = self.masks[vehicle]
+        changed = masks[parent >> shift & self.field] ^ masks[state >> shift & self.field]
+        if involved >> vehicle & 1 or changed & support:
+            return self.blocking_bound(state)
+        return bound
+
+    def decode(self, state):
+        # Board of vehicle letters, only needed for display
+        board = [[EMPTY] * self.cols for _ in range(self.rows)]
+        for (vehicle_id, horizontal, line, length), offset in zip(self.vehicles, self.offsets(state)):
+            for step in range(offset, offset + length):
+                if horizontal:
+                    board[line][step] = vehicle_id
+                else:
+                    board[step][line] = vehicle_id
+        return board
@@ -0,0 +1,129 @@
+from maze_graph import FlatGrid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; callers fall back to per-node search
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for wavefront distance fields")
+
+
+def wavefront_distances(grid, source, target=None):
+    # Level-synchronous BFS over a rectangular grid (0 = open, 1 = wall).
+    # Returns an int32 array of move counts from source, -1 where unreachable;
+    # with a target the flood stops as soon as it is reached.
+    _require_numpy()
+    open_cells = np.pad(np.asarray(grid, dtype=np.uint8) == 0, 1, constant_values=False)
+    padded_shape = open_cells.shape
+    open_flat = open_cells.ravel()
+    size = open_flat.size
+
+    # On the padded, flattened grid every axis move is a fixed index offset
+    strides = [stride // open_flat.itemsize for stride in open_cells.strides]
+    steps = np.array([sign * stride for stride in strides for sign in (-1, 1)])
+    dist = np.full(size, -1, dtype=np.int32)
+
+    def flat_index(position):
+        return sum((coord + 1) * stride for coord, stride in zip(position, strides))
+
+    origin = flat_index(source)
+    goal = flat_index(target) if target is not None else -1
+    dist[origin] = 0
+    frontier = np.array([origin])
+    level = 0
+
+    while frontier.size:
+        if goal >= 0 and dist[goal] >= 0:
+            break
+        level += 1
+
+        if frontier.size * 64 > size:
+            # Wide frontier: shift the whole boolean mask along every axis
+            current = np.zeros(size, dtype=bool)
+            current[frontier] = True
+            grown = np.zeros(size, dtype=bool)
+            for stride in strides:
+                grown[stride:] |= current[:-stride]
+                grown[:-stride] |= current[stride:]
+            grown &= open_flat
+            grown &= dist < 0
+            frontier = np.flatnonzero(grown)
+        else:
+            # Narrow frontier: gather neighbor indices instead of sweeping the grid
+            candidates = (frontier[:, None] + steps).ravel()
+            candidates = candidates[open_flat[candidates]]
+            frontier = np.unique(candidates[dist[candidates] < 0])
+
+        dist[frontier] = level
+
+    interior = tuple(slice(1, -1) for _ in padded_shape)
+    return dist.reshape(padded_shape)[interior].copy()
+
+
+class DistanceField:
+    # BFS distances from one source over a RectangularMaze2D/3D grid
+    def __init__(self, grid, source, target=None):
+        self.source = tuple(source)
+        self.distances = wavefront_distances(grid, self.source, target)
+
+    @classmethod
+    def from_maze(cls, maze, source=None):
+        if source is None:
+            source = maze.get_start_position()
+        return cls(maze.grid, source)
+
+    def distance(self, position):
+        dist = int(self.distances[tuple(position)])
+        return dist if dist >= 0 else None
+
+    def reachable(self, position):
+        return self.distances[tuple(position)] >= 0
+
+    def path_to(self, position):
+        # Walk downhill from position; each step lands on a cell one move
+        # closer to the source, so the result is a shortest path
+        current = tuple(position)
+        dist = self.distance(current)
+        if dist is None:
+            return []
+
+        path = [current]
+        while dist > 0:
+            current = self._downhill_neighbor(current, dist - 1)
+            dist -= 1
+            path.append(current)
+
+        path.reverse()
+        return path
+
+    def _downhill_neighbor(self, position, dist):
+        shape = self.distances.shape
+        for axis in range(len(shape)):
+            for delta in (-1, 1):
+                coord = position[axis] + delta
+                if 0 <= coord < shape[axis]:
+                    neighbor = position[:axis] + (coord,) + position[axis + 1:]
+                    if self.distances[neighbor] == dist:
+                        return neighbor
+        raise ValueError(f"Distance field is inconsistent at {position}")
+
+    def heuristic_to(self, graph, goal):
+        # Exact remaining distance for A* when this field is rooted at the
+        # goal; open cells are mutually reachable, so distances are symmetric
+        if graph.position(goal) != self.source:
+            raise ValueError("Distance field heuristic must be rooted at the goal")
+
+        unreachable = graph.num_nodes
+        field = np.where(self.distances >= 0, self.distances, unreachable)
+        if isinstance(graph, FlatGrid):
+            # FlatGrid node IDs index a grid padded by one cell on every side
+            field = np.pad(field, 1, constant_values=unreachable)
+        table = field.ravel().tolist()
+        return table.__getitem__
+
+
+def is_reachable(grid, start, goal):
+    return wavefront_distances(grid, tuple(start), tuple(goal))[tuple(goal)] >= 0